@@ -17,6 +17,7 @@ class BinaryAgreement:
         self.party_id = party_id
         self.n = n
         self.f = f
+        self.threshold = n - f
         self.network = network
         self.beacon = beacon
         self.instance_id = instance_id
@@ -27,16 +28,20 @@ class BinaryAgreement:
         self.decided = False
         self.decision = None
 
-        # Message counts per round
-        self.est_count = defaultdict(lambda: defaultdict(int))  # round -> value -> count
-        self.aux_count = defaultdict(lambda: defaultdict(int))  # round -> value -> count
+        # Message counts per round: round -> [count0, count1, countNone, total]
+        self.est_count = {}
+        self.aux_count = {}
 
         # Sent flags
         self.est_sent = defaultdict(bool)  # round -> bool
         self.aux_sent = defaultdict(bool)  # round -> bool
 
-        # Conditions
-        self.decision_condition = asyncio.Condition()
+        # Threshold events, set once n-f messages arrive for a round
+        self.est_ready = defaultdict(asyncio.Event)  # round -> Event
+        self.aux_ready = defaultdict(asyncio.Event)  # round -> Event
+
+        # Set once a decision is reached
+        self.decision_event = asyncio.Event()
 
     async def propose(self, value):
         """Propose a binary value (0 or 1)."""
@@ -47,10 +52,8 @@ class BinaryAgreement:
         asyncio.create_task(self._run_round())
 
         # Wait for decision
-        async with self.decision_condition:
-            while not self.decided:
-                await self.decision_condition.wait()
-            return self.decision
+        await self.decision_event.wait()
+        return self.decision
 
     async def _run_round(self):
         """Run one round of the ABA protocol."""
@@ -67,17 +70,17 @@ class BinaryAgreement:
                 })
 
             # Wait for n-f EST messages
-            while sum(self.est_count[r].values()) < self.n - self.f:
-                await asyncio.sleep(0.001)
+            await self.est_ready[r].wait()
 
             # Determine AUX value
-            if self.est_count[r][self.estimate] >= (self.n - self.f):
+            est = self._slot(self.est_count, r)
+            if est[self.estimate] >= self.threshold:
                 aux_value = self.estimate
             else:
                 # Check if there's a clear majority
-                if self.est_count[r][0] > self.est_count[r][1]:
+                if est[0] > est[1]:
                     aux_value = 0
-                elif self.est_count[r][1] > self.est_count[r][0]:
+                elif est[1] > est[0]:
                     aux_value = 1
                 else:
                     aux_value = None  # No clear majority
@@ -92,35 +95,32 @@ class BinaryAgreement:
                 })
 
             # Wait for n-f AUX messages
-            while sum(self.aux_count[r].values()) < self.n - self.f:
-                await asyncio.sleep(0.001)
-
-            # Check if we can decide
-            values_with_nf = [v for v in [0, 1] if self.aux_count[r][v] >= self.n - self.f]
-
-            if values_with_nf:
-                # At least one value has n-f support
-                if len(values_with_nf) == 1:
-                    # Only one value, can decide
-                    self.decision = values_with_nf[0]
-                    self.decided = True
-                    async with self.decision_condition:
-                        self.decision_condition.notify_all()
-                    return
-                else:
-                    # Both values have support, use coin
-                    coin = await self.beacon.request(self.party_id)
-                    coin_bit = coin % 2
-                    self.estimate = coin_bit
-            else:
-                # No value has n-f support, use coin
-                coin = await self.beacon.request(self.party_id)
-                coin_bit = coin % 2
-                self.estimate = coin_bit
+            await self.aux_ready[r].wait()
+
+            # Fast path: exactly one value has n-f support, decide without the coin
+            aux = self._slot(self.aux_count, r)
+            support0 = aux[0] >= self.threshold
+            support1 = aux[1] >= self.threshold
+
+            if support0 != support1:
+                self.decision = 1 if support1 else 0
+                self.decided = True
+                self.decision_event.set()
+                return
+
+            # Both or neither value has n-f support, use coin
+            coin = await self.beacon.request(self.party_id)
+            coin_bit = coin % 2
+            self.estimate = coin_bit
 
             # Move to next round
             self.round += 1
 
+    @staticmethod
+    def _slot(counts, r):
+        """Return the [count0, count1, countNone, total] counters for round r."""
+        return counts.setdefault(r, [0, 0, 0, 0])
+
     async def handle_message(self, message):
         """Process an ABA message."""
         msg_type = message.msg_type
@@ -141,7 +141,11 @@ class BinaryAgreement:
         value = payload['value']
 
         if value in [0, 1]:
-            self.est_count[r][value] += 1
+            slot = self._slot(self.est_count, r)
+            slot[value] += 1
+            slot[3] += 1
+            if slot[3] >= self.threshold:
+                self.est_ready[r].set()
 
     async def _handle_aux(self, payload):
         """Handle AUX message."""
@@ -149,5 +153,9 @@ class BinaryAgreement:
         value = payload['value']
 
         if value in [0, 1, None]:
-            self.aux_count[r][value] += 1
+            slot = self._slot(self.aux_count, r)
+            slot[2 if value is None else value] += 1
+            slot[3] += 1
+            if slot[3] >= self.threshold:
+                self.aux_ready[r].set()
 
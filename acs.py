@@ -18,6 +18,7 @@ class AgreementOnCommonSet:
         self.party_id = party_id
         self.n = n
         self.f = f
+        self.threshold = n - f
         self.network = network
         self.beacon = beacon
 
@@ -28,7 +29,8 @@ class AgreementOnCommonSet:
         self.abas = {}
 
         # Delivered RBC values
-        self.delivered_rbcs = set()
+        self.delivered_mask = 0  # bit i set once RBC_i has delivered
+        self.rbcs_ready = asyncio.Event()  # set once n-f RBCs delivered
 
     async def propose(self, value):
         """
@@ -41,8 +43,7 @@ class AgreementOnCommonSet:
         # Phase 2: Wait for n-f RBC deliveries
         asyncio.create_task(self._monitor_rbc_deliveries())
 
-        while len(self.delivered_rbcs) < self.n - self.f:
-            await asyncio.sleep(0.001)
+        await self.rbcs_ready.wait()
 
         # Phase 3: Run ABA for each party
         aba_results = {}
@@ -50,7 +51,7 @@ class AgreementOnCommonSet:
 
         for i in range(self.n):
             # Propose 1 if I've delivered RBC_i, else 0
-            proposal = 1 if i in self.delivered_rbcs else 0
+            proposal = (self.delivered_mask >> i) & 1
 
             aba = BinaryAgreement(self.party_id, self.n, self.f,
                                  self.network, self.beacon, instance_id=i)
@@ -60,52 +61,56 @@ class AgreementOnCommonSet:
             task = asyncio.create_task(self._run_aba(i, aba, proposal))
             aba_tasks.append(task)
 
-        # Wait for all ABAs to complete
-        results = await asyncio.gather(*aba_tasks)
-
-        for i, result in enumerate(results):
+        # Phase 4: V is the first n-f parties (by ID) with ABA output 1. Stop
+        # waiting as soon as a decided prefix of instances already yields V;
+        # the remaining ABAs keep running so other parties can still finish.
+        V = []
+        for next_done in asyncio.as_completed(aba_tasks):
+            i, result = await next_done
             aba_results[i] = result
 
-        # Phase 4: Collect the set S of parties with ABA output 1
-        S = {i for i in range(self.n) if aba_results[i] == 1}
-
-        # Ensure we have at least n-f parties
-        assert len(S) >= self.n - self.f, f"ACS: Not enough parties in S: {len(S)}"
-
-        # Select exactly n-f parties (first n-f by ID)
-        V = sorted(S)[: self.n - self.f]
-
-        # Wait for any pending RBCs in V
+            V = []
+            for j in range(self.n):
+                if j not in aba_results:
+                    break
+                if aba_results[j] == 1:
+                    V.append(j)
+            if len(V) >= self.threshold:
+                break
+
+        # Ensure we have at least n-f parties, then select exactly n-f
+        assert len(V) >= self.threshold, f"ACS: Not enough parties in S: {len(V)}"
+        V = V[: self.threshold]
+
+        # Collect values, waiting for any pending RBCs in V in parallel
+        values = await asyncio.gather(*[self.rbc.deliver(i) for i in V])
         for i in V:
-            if i not in self.delivered_rbcs:
-                await self.rbc.deliver(i)
-                self.delivered_rbcs.add(i)
+            self.delivered_mask |= 1 << i
 
-        # Collect values
-        result_set = {}
-        for i in V:
-            value = await self.rbc.deliver(i)
-            result_set[i] = value
-
-        return result_set
+        return dict(zip(V, values))
 
     async def _monitor_rbc_deliveries(self):
-        """Monitor and track RBC deliveries."""
-        for i in range(self.n):
-            if i not in self.delivered_rbcs:
-                asyncio.create_task(self._wait_for_rbc(i))
+        """Monitor and track RBC deliveries from a single coroutine."""
+        pending = [self._wait_for_rbc(i) for i in range(self.n)
+                   if not (self.delivered_mask >> i) & 1]
+
+        for next_done in asyncio.as_completed(pending):
+            try:
+                sender = await next_done
+            except Exception:
+                continue
+            self.delivered_mask |= 1 << sender
+            if bin(self.delivered_mask).count('1') >= self.threshold:
+                self.rbcs_ready.set()
 
     async def _wait_for_rbc(self, sender):
-        """Wait for RBC from sender to deliver."""
-        try:
-            await self.rbc.deliver(sender)
-            self.delivered_rbcs.add(sender)
-        except:
-            pass
+        """Wait for RBC from sender to deliver. Returns the sender."""
+        await self.rbc.deliver(sender)
+        return sender
 
     async def _run_aba(self, instance_id, aba, proposal):
-        """Run an ABA instance."""
-        return await aba.propose(proposal)
+        """Run an ABA instance. Returns (instance_id, decision)."""
+        return instance_id, await aba.propose(proposal)
 
     async def handle_message(self, message):
         """Process ACS-related messages."""
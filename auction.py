@@ -3,6 +3,7 @@ Second-Price Auction Protocol using MPC.
 """
 
 import asyncio
+import sys
 from party import MPCParty
 from circuit import ArithmeticCircuit
 from field import Field
@@ -28,6 +29,11 @@ class AuctionProtocol:
         self.f = (self.n - 1) // 3
         self.k = k
 
+        # Interned secret ids, reused across auction runs
+        self.secret_ids = [
+            [sys.intern(f"bid_{p}_bit_{b}") for b in range(k)] for p in range(self.n)
+        ]
+
     async def run_auction(self, bids):
         """
         Run the second-price auction.
@@ -46,18 +52,12 @@ class AuctionProtocol:
         share_tasks = []
         for party_id, party in enumerate(self.parties):
             bid = bids.get(party_id, 0)
-            # Share bid bits
+            # Share bid bits, one task per party
             bits = ArithmeticCircuit.bit_decompose(bid, self.k)
-            for bit_idx, bit_val in enumerate(bits):
-                secret_id = f"bid_{party_id}_bit_{bit_idx}"
-                if party_id == party.party_id:
-                    task = party.share_value(bit_val, secret_id)
-                else:
-                    task = party.receive_share(party_id, secret_id)
-                share_tasks.append(task)
+            share_tasks.append(self._share_party_bits(party, party_id, bits))
 
         await asyncio.gather(*share_tasks)
-        print(f"  ✓ Shared {len(share_tasks)} bit values")
+        print(f"  ✓ Shared {len(share_tasks) * self.k} bit values")
 
         # Phase 2: Agreement on input set using ACS
         print("\n[Phase 2] Agreement on Input Set...")
@@ -84,34 +84,30 @@ class AuctionProtocol:
 
         # Phase 4: Output delivery with masking
         print("\n[Phase 4] Output Delivery...")
-        outputs = {}
-
-        for party_id, party in enumerate(self.parties):
-            # Generate random mask
-            r_i = Field.random()
-
-            # Get public beacon value
-            rho = await self.beacon.request(party_id)
-
-            # Compute blinded output
-            if party_id == winner_id:
-                o_i = second_price
-            else:
-                o_i = 0
-
-            # z_i = o_i + r_i + rho (public)
-            z_i = Field.add(Field.add(o_i, r_i), rho)
-
-            # Broadcast z_i (in real protocol, would use shares)
-            await self.network.broadcast(party_id, 'OUTPUT_SHARE', {
-                'party': party_id,
-                'z': z_i
-            })
-
-            # Collect z values (simplified - in real protocol, would use proper reconstruction)
-            # Party i computes: o_i = z_i - r_i - rho
-            actual_output = Field.sub(Field.sub(z_i, r_i), rho)
-            outputs[party_id] = actual_output
+        # Public beacon value, requested by all parties at one shared index
+        index = self.beacon.reserve_index()
+        rhos = await asyncio.gather(*[
+            self.beacon.request(party_id, index=index) for party_id in range(self.n)
+        ])
+        rho = rhos[0]
+
+        # Generate random masks and blinded outputs: z_i = o_i + r_i + rho (public)
+        masks = [Field.random() for _ in range(self.n)]
+        blinded = [
+            Field.add(Field.add(second_price if party_id == winner_id else 0, r_i), rho)
+            for party_id, r_i in enumerate(masks)
+        ]
+
+        # Broadcast all z values in one batch (in real protocol, would use shares)
+        await self.network.broadcast(0, 'OUTPUT_BATCH', {
+            'outputs': dict(enumerate(blinded))
+        })
+
+        # Party i computes: o_i = z_i - r_i - rho
+        outputs = {
+            party_id: Field.sub(Field.sub(z_i, r_i), rho)
+            for party_id, (z_i, r_i) in enumerate(zip(blinded, masks))
+        }
 
         print(f"  ✓ Outputs delivered")
 
@@ -123,6 +119,15 @@ class AuctionProtocol:
 
         return outputs
 
+    async def _share_party_bits(self, party, party_id, bits):
+        """Share (or receive) all bits of party_id's bid sequentially."""
+        for bit_idx, bit_val in enumerate(bits):
+            secret_id = self.secret_ids[party_id][bit_idx]
+            if party_id == party.party_id:
+                await party.share_value(bit_val, secret_id)
+            else:
+                await party.receive_share(party_id, secret_id)
+
     async def run_auction_with_mpc(self, bids):
         """
         Run auction with full MPC circuit evaluation (more complex).
@@ -27,8 +27,15 @@ class RandomnessBeacon:
         # Store generated values
         self.values = {}  # index -> random value
 
-        # Conditions for waiting parties
-        self.conditions = {}  # index -> asyncio.Condition
+        # Events for waiting parties, set once the value is generated
+        self.events = {}  # index -> asyncio.Event
+
+        # Parties that have received the value, for releasing finished indices
+        self.observed = {}  # index -> set of party ids
+
+        # Values of released indices, so late or repeated requests still
+        # get the value instead of waiting on state that is gone
+        self.released = {}  # index -> random value
 
         # Metrics
         self.total_invocations = 0
@@ -40,32 +47,50 @@ class RandomnessBeacon:
         Returns the beacon value once threshold requests are met.
         """
         if index is None:
-            index = self.index
-            self.index += 1
+            index = self.reserve_index()
+
+        # Already released: the value is public, return it
+        if index in self.released:
+            return self.released[index]
 
         # Initialize structures for this index
         if index not in self.requests:
             self.requests[index] = set()
-            self.conditions[index] = asyncio.Condition()
-
-        async with self.conditions[index]:
-            # Add this party's request
-            self.requests[index].add(party_id)
-
-            # Check if we've reached threshold
-            if len(self.requests[index]) >= self.threshold:
-                if index not in self.values:
-                    # Generate random value
-                    self.values[index] = Field.random()
-                    self.total_invocations += 1
-                    # Notify all waiting parties
-                    self.conditions[index].notify_all()
-
-            # Wait for value to be generated
-            while index not in self.values:
-                await self.conditions[index].wait()
-
-            return self.values[index]
+            self.events[index] = asyncio.Event()
+            self.observed[index] = set()
+
+        # Add this party's request
+        self.requests[index].add(party_id)
+
+        # Check if we've reached threshold
+        if len(self.requests[index]) >= self.threshold:
+            if index not in self.values:
+                # Generate random value
+                self.values[index] = Field.random()
+                self.total_invocations += 1
+                # Wake all waiting parties
+                self.events[index].set()
+
+        # Wait for value to be generated
+        await self.events[index].wait()
+        value = self.values[index]
+
+        # Release the index once every party has seen its value
+        observed = self.observed[index]
+        observed.add(party_id)
+        if len(observed) == self.n:
+            del self.requests[index]
+            del self.events[index]
+            del self.observed[index]
+            self.released[index] = self.values.pop(index)
+
+        return value
+
+    def reserve_index(self):
+        """Reserve the next sequential index for a jointly requested value."""
+        index = self.index
+        self.index += 1
+        return index
 
     def get_invocation_count(self):
         """Return total number of beacon invocations."""
@@ -76,6 +101,8 @@ class RandomnessBeacon:
         self.index = 0
         self.requests.clear()
         self.values.clear()
-        self.conditions.clear()
+        self.events.clear()
+        self.observed.clear()
+        self.released.clear()
         self.total_invocations = 0
 
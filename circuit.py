@@ -3,9 +3,118 @@ Arithmetic circuit evaluation with secret sharing.
 Implements bit decomposition, comparison, and max gadgets.
 """
 
+import functools
+
 from field import Field, Polynomial
 
 
+def _make_compare(k):
+    """
+    Generate a straight-line comparator for k-bit inputs.
+    Unrolls the suffix-product form of compare_bits so no Python loops run
+    per comparison.
+    """
+    lines = ["def compare(a, b, fma=Field.fma, sub=Field.sub, mul=Field.mul):"]
+    for l in range(k):
+        lines.append(f"    d{l} = sub(a[{l}], b[{l}])")
+        lines.append(f"    e{l} = sub(1, mul(d{l}, d{l}))")
+    # s{j} = prod_{l=j}^{k-1} e_l
+    lines.append(f"    s{k - 1} = e{k - 1}")
+    for l in range(k - 2, 0, -1):
+        lines.append(f"    s{l} = mul(s{l + 1}, e{l})")
+    lines.append(f"    r = mul(a[{k - 1}], sub(1, b[{k - 1}]))")
+    for j in range(k - 2, -1, -1):
+        lines.append(f"    r = fma(mul(a[{j}], sub(1, b[{j}])), s{j + 1}, r)")
+    lines.append("    return r")
+
+    namespace = {'Field': Field}
+    exec("\n".join(lines), namespace)
+    return namespace['compare']
+
+
+# Bids are 5-bit by default, so that comparator is specialized at import
+_compare_k5 = _make_compare(5)
+
+# Beyond this many bids the generated scan gets long; use the loop instead
+_MAX_UNROLLED_BIDS = 64
+
+# Below this many pairs in the first round, find_max's pairwise tournament
+# (the unrolled comparator for k=5) beats transposing into compare_bits_batch
+_MIN_BATCH_PAIRS = 16
+
+
+@functools.lru_cache(maxsize=None)
+def _make_auction(n, k):
+    """
+    Generate the find_max_and_second scan unrolled for n values of k bits.
+    The generated function takes (values, bits) and returns
+    (max_value, winner_index, second_max_value), with every select
+    written out inline.
+    """
+    # select(c, x, y) = c*x + (1-c)*y, on the comparison bits c and d
+    def select_c(x, y):
+        return f"(c * {x} + nc * {y}) % p"
+
+    def select_d(x, y):
+        return f"(d * {x} + nd * {y}) % p"
+
+    def bits_tuple(make):
+        return "(" + "".join(make(l) + ", " for l in range(k)) + ")"
+
+    names = ", ".join(f"v{i}" for i in range(n))
+    bit_names = ", ".join(f"b{i}" for i in range(n))
+    lines = [
+        "def auction(values, bits, compare=compare, p=MODULUS):",
+        f"    {names}, = values",
+        f"    {bit_names}, = bits",
+        "    m1, i1, m1b = v0, 0, b0",
+        f"    m2, m2b = 0, {bits_tuple(lambda l: '0')}",
+    ]
+    for i in range(1, n):
+        lines += [
+            f"    c = compare(b{i}, m1b)",
+            f"    d = compare(b{i}, m2b)",
+            "    nc = 1 - c",
+            "    nd = 1 - d",
+            f"    lo = {select_d(f'v{i}', 'm2')}",
+            f"    lob = {bits_tuple(lambda l: select_d(f'b{i}[{l}]', f'm2b[{l}]'))}",
+            f"    m2 = {select_c('m1', 'lo')}",
+            f"    m2b = {bits_tuple(lambda l: select_c(f'm1b[{l}]', f'lob[{l}]'))}",
+            f"    m1 = {select_c(f'v{i}', 'm1')}",
+            f"    m1b = {bits_tuple(lambda l: select_c(f'b{i}[{l}]', f'm1b[{l}]'))}",
+            f"    i1 = {select_c(i, 'i1')}",
+        ]
+    lines.append("    return (m1, i1, m2)")
+
+    compare = _compare_k5 if k == 5 else ArithmeticCircuit.compare_bits
+    namespace = {'compare': compare, 'MODULUS': Field.MODULUS}
+    exec("\n".join(lines), namespace)
+    return namespace['auction']
+
+
+@functools.lru_cache(maxsize=None)
+def _bit_table(k):
+    """Bit lists [b_0, ..., b_{k-1}] for every k-bit value, indexed by value."""
+    shifts = range(k)
+    return tuple(tuple((v >> i) & 1 for i in shifts) for v in range(1 << k))
+
+
+def _wide_bits(value, k):
+    """Decompose into k > 8 bits a byte at a time from the 8-bit table."""
+    byte_table = _BYTE_TABLE
+    bits = []
+    for shift in range(0, k, 8):
+        bits += byte_table[(value >> shift) & 0xFF]
+    del bits[k:]
+    return bits
+
+
+# Widths up to a byte index a direct table; wider ones go byte by byte, so
+# every table stays at most 256 entries. Bids are 5-bit by default.
+_BYTE_TABLE = _bit_table(8)
+_bit_table(5)
+
+
 class ArithmeticCircuit:
     """
     Arithmetic circuit for second-price auction.
@@ -18,10 +127,21 @@ class ArithmeticCircuit:
         Decompose value into k bits.
         Returns list of bits [b_0, b_1, ..., b_{k-1}] where value = sum(b_i * 2^i).
         """
-        bits = []
-        for i in range(k):
-            bits.append((value >> i) & 1)
-        return bits
+        if k <= 8:
+            return list(_bit_table(k)[value & ((1 << k) - 1)])
+        return _wide_bits(value, k)
+
+    @staticmethod
+    def bit_decompose_all(values, k=5):
+        """
+        Decompose every value into k bits.
+        Returns one bit list per value, in the same order.
+        """
+        if k <= 8:
+            table = _bit_table(k)
+            mask = (1 << k) - 1
+            return [list(table[v & mask]) for v in values]
+        return [_wide_bits(v, k) for v in values]
 
     @staticmethod
     def compare_bits(a_bits, b_bits):
@@ -33,22 +153,51 @@ class ArithmeticCircuit:
         Formula: c = sum_{j=k-1}^{0} (a_j * (1 - b_j)) * prod_{l=j+1}^{k-1} (1 - (a_l - b_l)^2)
         """
         k = len(a_bits)
+        if k == 5:
+            # Unrolled comparator, same formula
+            return _compare_k5(a_bits, b_bits)
+
         result = 0
 
+        # Hoisted per-bit terms: (1 - b_l), (a_l - b_l) and eq_l = 1 - (a_l - b_l)^2
+        not_b = [Field.sub(1, b) for b in b_bits]
+        diffs = [Field.sub(a, b) for a, b in zip(a_bits, b_bits)]
+        eq = [Field.sub(1, Field.mul(d, d)) for d in diffs]
+
+        # Suffix products: suffix[j] = prod_{l=j}^{k-1} eq_l
+        suffix = [1] * (k + 1)
+        for l in range(k - 1, -1, -1):
+            suffix[l] = Field.mul(suffix[l + 1], eq[l])
+
         for j in range(k - 1, -1, -1):
-            # Compute (a_j * (1 - b_j))
-            term = Field.mul(a_bits[j], Field.sub(1, b_bits[j]))
+            # (a_j * (1 - b_j)) * prod_{l=j+1}^{k-1} eq_l
+            term = Field.mul(a_bits[j], not_b[j])
+            result = Field.fma(term, suffix[j + 1], result)
 
-            # Compute enable flag: prod_{l=j+1}^{k-1} (1 - (a_l - b_l)^2)
-            enable = 1
-            for l in range(j + 1, k):
-                diff = Field.sub(a_bits[l], b_bits[l])
-                diff_sq = Field.mul(diff, diff)
-                enable = Field.mul(enable, Field.sub(1, diff_sq))
+        return result
+
+    @staticmethod
+    def compare_bits_batch(a_rows, b_rows):
+        """
+        Compare many pairs of k-bit numbers at once.
+        a_rows, b_rows: equal-length lists of bit lists.
+        Returns [compare_bits(a, b) for a, b in zip(a_rows, b_rows)].
 
-            # Add to result
-            result = Field.add(result, Field.mul(term, enable))
+        Works column by column from the most significant bit, carrying the
+        running result and equality product for every pair.
+        """
+        if not a_rows:
+            return []
+        p = Field.MODULUS
+        count = len(a_rows)
+        result = [0] * count
+        eq = [1] * count  # prod over the higher bits of 1 - (a_l - b_l)^2
 
+        for a_col, b_col in zip(reversed(list(zip(*a_rows))), reversed(list(zip(*b_rows)))):
+            result = [(r + a * (1 - b) * e) % p
+                      for r, e, a, b in zip(result, eq, a_col, b_col)]
+            eq = [e * (1 - (a - b) * (a - b)) % p
+                  for e, a, b in zip(eq, a_col, b_col)]
         return result
 
     @staticmethod
@@ -66,9 +215,10 @@ class ArithmeticCircuit:
         return Field.add(term1, term2)
 
     @staticmethod
-    def find_max(values, k=5):
+    def find_max(values, k=5, bits=None):
         """
         Find maximum value using tournament tree.
+        bits: optional precomputed bit decompositions of values.
         Returns (max_value, winner_index).
         """
         n = len(values)
@@ -78,12 +228,57 @@ class ArithmeticCircuit:
             return (values[0], 0)
 
         # Bit decompose all values
-        all_bits = [ArithmeticCircuit.bit_decompose(v, k) for v in values]
+        if bits is None:
+            bits = ArithmeticCircuit.bit_decompose_all(values, k)
+
+        if n < 2 * _MIN_BATCH_PAIRS:
+            return ArithmeticCircuit._find_max_pairwise(values, bits)
 
-        # Tournament tree
+        # Tournament tree: each round compares all its pairs in one batch
+        select = ArithmeticCircuit.select
         current_values = list(values)
         current_indices = list(range(n))
-        current_bits = all_bits
+        current_bits = list(bits)
+
+        while len(current_values) > 1:
+            # Odd one out advances unchanged
+            pairs = len(current_values) // 2
+            left, right = slice(0, 2 * pairs, 2), slice(1, 2 * pairs, 2)
+            comparisons = ArithmeticCircuit.compare_bits_batch(
+                current_bits[left], current_bits[right]
+            )
+
+            next_values = []
+            next_indices = []
+            next_bits = []
+            for c, a, b, a_idx, b_idx, a_bits, b_bits in zip(
+                comparisons,
+                current_values[left], current_values[right],
+                current_indices[left], current_indices[right],
+                current_bits[left], current_bits[right],
+            ):
+                # Determine which was larger: max(a, b) = c*a + (1-c)*b
+                if select(c, a, b) == a:
+                    next_values.append(a)
+                    next_indices.append(a_idx)
+                    next_bits.append(a_bits)
+                else:
+                    next_values.append(b)
+                    next_indices.append(b_idx)
+                    next_bits.append(b_bits)
+
+            current_values = next_values + current_values[2 * pairs:]
+            current_indices = next_indices + current_indices[2 * pairs:]
+            current_bits = next_bits + current_bits[2 * pairs:]
+
+        return (current_values[0], current_indices[0])
+
+    @staticmethod
+    def _find_max_pairwise(values, bits):
+        """find_max's tournament, comparing one pair at a time with max_two."""
+        current_values = list(values)
+        current_indices = list(range(len(values)))
+        current_bits = list(bits)
 
         while len(current_values) > 1:
             next_values = []
@@ -119,23 +314,81 @@ class ArithmeticCircuit:
         return (current_values[0], current_indices[0])
 
     @staticmethod
-    def find_second_max(values, winner_idx, k=5):
+    def find_second_max(values, winner_idx, k=5, bits=None):
         """
         Find second maximum by masking winner and finding max again.
+        bits: optional precomputed bit decompositions of values.
         Returns second_max_value.
         """
+        if bits is None:
+            bits = ArithmeticCircuit.bit_decompose_all(values, k)
+
         # Create masked values: x'_i = (1 - chi_i) * x_i
         masked_values = []
+        masked_bits = []
         for i, v in enumerate(values):
             if i == winner_idx:
                 masked_values.append(0)  # Mask the winner
+                masked_bits.append([0] * k)
             else:
                 masked_values.append(v)
+                masked_bits.append(bits[i])
 
         # Find max of masked values
-        second_max, _ = ArithmeticCircuit.find_max(masked_values, k)
+        second_max, _ = ArithmeticCircuit.find_max(masked_values, k, masked_bits)
         return second_max
 
+    @staticmethod
+    def select(c, a, b):
+        """
+        Arithmetic select on a comparison bit.
+
+        Formula: select(c, a, b) = c*a + (1-c)*b
+        """
+        return Field.fma(c, a, Field.mul(Field.sub(1, c), b))
+
+    @staticmethod
+    def find_max_and_second(values, k=5, bits=None):
+        """
+        Find maximum and second maximum in a single linear scan.
+        Each step uses arithmetic selects on comparison bits, so no
+        intermediate comparison result is revealed.
+        bits: optional precomputed bit decompositions of values.
+        Returns (max_value, winner_index, second_max_value).
+        """
+        n = len(values)
+        if n == 0:
+            return (0, -1, 0)
+        if bits is None:
+            bits = ArithmeticCircuit.bit_decompose_all(values, k)
+        if n <= _MAX_UNROLLED_BIDS:
+            # Same scan, generated once per (n, k) without loops
+            return _make_auction(n, k)(values, bits)
+
+        select = ArithmeticCircuit.select
+        m1, i1, m1_bits = values[0], 0, bits[0]
+        m2, m2_bits = 0, [0] * k
+
+        for i in range(1, n):
+            v = values[i]
+            v_bits = bits[i]
+
+            # c = (v > m1): v becomes the new max, old max drops to second
+            c = ArithmeticCircuit.compare_bits(v_bits, m1_bits)
+            # d = (v > m2): v replaces second max if it loses to m1
+            d = ArithmeticCircuit.compare_bits(v_bits, m2_bits)
+
+            loser = select(d, v, m2)
+            loser_bits = [select(d, x, y) for x, y in zip(v_bits, m2_bits)]
+
+            m2 = select(c, m1, loser)
+            m2_bits = [select(c, x, y) for x, y in zip(m1_bits, loser_bits)]
+            m1 = select(c, v, m1)
+            m1_bits = [select(c, x, y) for x, y in zip(v_bits, m1_bits)]
+            i1 = select(c, i, i1)
+
+        return (m1, i1, m2)
+
     @staticmethod
     def second_price_auction(bids, k=5):
         """
@@ -143,12 +396,8 @@ class ArithmeticCircuit:
         bids: list of bid values
         Returns: (winner_id, second_price)
         """
-        # Find winner
-        max_bid, winner_id = ArithmeticCircuit.find_max(bids, k)
-
-        # Find second price
-        second_price = ArithmeticCircuit.find_second_max(bids, winner_id, k)
-
+        bits = ArithmeticCircuit.bit_decompose_all(bids, k)
+        _, winner_id, second_price = ArithmeticCircuit.find_max_and_second(bids, k, bits)
         return (winner_id, second_price)
 
     @staticmethod
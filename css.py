@@ -3,14 +3,33 @@ Complete Secret Sharing based on BGW with bi-variate polynomials.
 """
 
 import asyncio
+from array import array
 from field import Field, Polynomial, BiVariatePolynomial
 from rbc import ReliableBroadcast
 
 
+def _pack_coeffs(coeffs):
+    """Pack field coefficients (< 2^31) as int64 bytes."""
+    return array('q', coeffs).tobytes()
+
+
+def _unpack_coeffs(data):
+    """Unpack int64 bytes produced by _pack_coeffs."""
+    coeffs = array('q')
+    coeffs.frombytes(data)
+    return coeffs.tolist()
+
+
 class CompleteSecretSharing:
     """
     Complete Secret Sharing protocol using bi-variate polynomials.
     Satisfies: Termination, Hiding, Binding, Completeness, and Validity.
+
+    Message payloads are positional tuples:
+        CSS_SHARE:       (dealer, packed row coeffs, packed col coeffs)
+        CSS_SUBSHARE:    (dealer, row_eval, col_eval)
+        CSS_HAPPY:       (dealer, happy)
+        CSS_RECONSTRUCT: (dealer, share)
     """
 
     def __init__(self, party_id, n, f, network, beacon):
@@ -26,14 +45,23 @@ class CompleteSecretSharing:
         # Sharing state per dealer
         self.row_polys = {}  # dealer -> Polynomial
         self.col_polys = {}  # dealer -> Polynomial
+        self.share_evals = {}  # dealer -> (row evals, col evals) at every party id
         self.sub_shares = {}  # dealer -> {party -> (row_eval, col_eval)}
         self.public_parties = {}  # dealer -> set of public party ids
-        self.happy_count = {}  # dealer -> count of happy parties
+        self.happy_parties = {}  # dealer -> set of parties that reported happy
         self.completed = {}  # dealer -> bool
 
+        self.reconstruct_shares = {}  # dealer -> {party -> share}
+
         # Conditions
         self.completion_conditions = {}  # dealer -> asyncio.Condition
 
+        # Threshold events, set by the message handlers
+        self.subshare_ready = {}  # dealer -> Event, n-f sub-shares received
+        self.happy_ready = {}  # dealer -> Event, n-f happy messages received
+        self.reconstruct_ready = {}  # dealer -> Event, f+1 shares received
+        self.share_arrived = {}  # dealer -> Event, my row/col received from dealer
+
     async def share(self, secret):
         """
         Share a secret as dealer.
@@ -41,17 +69,12 @@ class CompleteSecretSharing:
         """
         # Phase 1: Create bi-variate polynomial and send rows/columns
         poly = BiVariatePolynomial(self.f, secret)
+        rows, cols = poly.row_col_coeffs(range(self.n))
 
         for party_id in range(self.n):
-            row = poly.row_polynomial(party_id)
-            col = poly.col_polynomial(party_id)
-
-            # Send row and column polynomials
-            await self.network.send(self.party_id, party_id, 'CSS_SHARE', {
-                'dealer': self.party_id,
-                'row': row.coeffs,
-                'col': col.coeffs
-            })
+            await self.network.send(self.party_id, party_id, 'CSS_SHARE', (
+                self.party_id, _pack_coeffs(rows[party_id]), _pack_coeffs(cols[party_id])
+            ))
 
         # Wait for completion
         return await self.receive_share(self.party_id)
@@ -61,47 +84,35 @@ class CompleteSecretSharing:
         Receive share from dealer.
         Returns (row_poly, col_poly) or (None, None) if sharing failed.
         """
-        if dealer not in self.completion_conditions:
-            self.completion_conditions[dealer] = asyncio.Condition()
-            self.sub_shares[dealer] = {}
-            self.public_parties[dealer] = set()
-            self.happy_count[dealer] = 0
+        self._init_dealer(dealer)
 
         # Wait for share message or timeout
-        timeout = 0
-        while dealer not in self.row_polys and timeout < 100:
-            await asyncio.sleep(0.001)
-            timeout += 1
+        try:
+            await asyncio.wait_for(self.share_arrived[dealer].wait(), 0.1)
+        except asyncio.TimeoutError:
+            pass  # Continue without a share; this party will not be happy
 
         # Phase 2: Exchange sub-shares
         if dealer in self.row_polys:
-            my_row = self.row_polys[dealer]
-            my_col = self.col_polys[dealer]
+            row_evals, col_evals = self._share_evals(dealer)
 
             for party_id in range(self.n):
                 if party_id != self.party_id:
-                    await self.network.send(self.party_id, party_id, 'CSS_SUBSHARE', {
-                        'dealer': dealer,
-                        'row_eval': my_row.eval(party_id),
-                        'col_eval': my_col.eval(party_id)
-                    })
+                    await self.network.send(self.party_id, party_id, 'CSS_SUBSHARE', (
+                        dealer, row_evals[party_id], col_evals[party_id]
+                    ))
 
         # Wait for n-f sub-shares
-        while len(self.sub_shares[dealer]) < self.n - self.f:
-            await asyncio.sleep(0.001)
+        await self.subshare_ready[dealer].wait()
 
         # Phase 3: Check if happy
         is_happy = self._check_happy(dealer)
 
         # Broadcast happiness
-        await self.network.broadcast(self.party_id, 'CSS_HAPPY', {
-            'dealer': dealer,
-            'happy': is_happy
-        })
+        await self.network.broadcast(self.party_id, 'CSS_HAPPY', (dealer, is_happy))
 
         # Wait for n-f happy messages
-        while self.happy_count[dealer] < self.n - self.f:
-            await asyncio.sleep(0.001)
+        await self.happy_ready[dealer].wait()
 
         # Phase 4: Finalize
         async with self.completion_conditions[dealer]:
@@ -114,66 +125,107 @@ class CompleteSecretSharing:
             # Return zero polynomials
             return (Polynomial([0]), Polynomial([0]))
 
+    def _init_dealer(self, dealer):
+        """Create the per-dealer state on first use (from either side)."""
+        if dealer not in self.completion_conditions:
+            self.completion_conditions[dealer] = asyncio.Condition()
+            self.sub_shares.setdefault(dealer, {})
+            self.public_parties.setdefault(dealer, set())
+            self.happy_parties.setdefault(dealer, set())
+            self.reconstruct_shares.setdefault(dealer, {})
+            self.subshare_ready[dealer] = asyncio.Event()
+            self.happy_ready[dealer] = asyncio.Event()
+            self.reconstruct_ready[dealer] = asyncio.Event()
+            self.share_arrived.setdefault(dealer, asyncio.Event())
+
     def _check_happy(self, dealer):
         """Check if this party is happy with the sharing."""
         # Check if we have valid shares
         if dealer not in self.row_polys:
             return False
 
-        my_row = self.row_polys[dealer]
-        my_col = self.col_polys[dealer]
+        row_evals, col_evals = self._share_evals(dealer)
 
-        # Check consistency with received sub-shares
+        # Check consistency with received sub-shares: party j sent
+        # (row_j(i), col_j(i)) = (p(j, i), p(i, j)) to me (party i)
         for party_id, (row_eval, col_eval) in self.sub_shares[dealer].items():
-            # row_i(party_id) should equal col_party_id(i)
-            if my_row.eval(party_id) != row_eval:
+            # col_i(j) = p(j, i) should equal row_j(i)
+            if col_evals[party_id] != row_eval:
                 return False
-            if my_col.eval(self.party_id) != col_eval:
+            # row_i(j) = p(i, j) should equal col_j(i)
+            if row_evals[party_id] != col_eval:
                 return False
 
         return True
 
+    def _share_evals(self, dealer):
+        """Evaluate my row/col polynomials from dealer at every party id, once."""
+        if dealer not in self.share_evals:
+            my_row = self.row_polys[dealer]
+            my_col = self.col_polys[dealer]
+            self.share_evals[dealer] = (
+                [my_row.eval(party_id) for party_id in range(self.n)],
+                [my_col.eval(party_id) for party_id in range(self.n)],
+            )
+        return self.share_evals[dealer]
+
     async def handle_message(self, message):
         """Process CSS message."""
         msg_type = message.msg_type
-        payload = message.payload
 
         if msg_type == 'CSS_SHARE':
-            await self._handle_share(payload)
+            await self._handle_share(message)
         elif msg_type == 'CSS_SUBSHARE':
-            await self._handle_subshare(payload)
+            await self._handle_subshare(message)
         elif msg_type == 'CSS_HAPPY':
-            await self._handle_happy(payload)
+            await self._handle_happy(message)
+        elif msg_type == 'CSS_RECONSTRUCT':
+            await self._handle_reconstruct(message)
         elif msg_type.startswith('RBC_'):
             await self.rbc.handle_message(message)
 
-    async def _handle_share(self, payload):
+    async def _handle_share(self, message):
         """Handle SHARE message from dealer."""
-        dealer = payload['dealer']
+        dealer, row, col = message.payload
 
-        if dealer not in self.row_polys:
-            self.row_polys[dealer] = Polynomial(payload['row'])
-            self.col_polys[dealer] = Polynomial(payload['col'])
+        # Only the dealer itself may hand out its rows/columns
+        if message.sender == dealer and dealer not in self.row_polys:
+            self.row_polys[dealer] = Polynomial(_unpack_coeffs(row))
+            self.col_polys[dealer] = Polynomial(_unpack_coeffs(col))
+            self.share_arrived.setdefault(dealer, asyncio.Event()).set()
 
-    async def _handle_subshare(self, payload):
+    async def _handle_subshare(self, message):
         """Handle SUBSHARE message."""
-        dealer = payload['dealer']
-        sender = message.sender if hasattr(message, 'sender') else None
+        dealer, row_eval, col_eval = message.payload
 
-        if dealer not in self.sub_shares:
-            self.sub_shares[dealer] = {}
+        self._init_dealer(dealer)
 
-        self.sub_shares[dealer][sender] = (payload['row_eval'], payload['col_eval'])
+        self.sub_shares[dealer][message.sender] = (row_eval, col_eval)
+        if len(self.sub_shares[dealer]) >= self.n - self.f:
+            self.subshare_ready[dealer].set()
 
-    async def _handle_happy(self, payload):
+    async def _handle_happy(self, message):
         """Handle HAPPY message."""
-        dealer = payload['dealer']
+        dealer, happy = message.payload
+
+        self._init_dealer(dealer)
+
+        if happy:
+            # Count each party once, even if its message is replayed
+            happy_parties = self.happy_parties[dealer]
+            happy_parties.add(message.sender)
+            if len(happy_parties) >= self.n - self.f:
+                self.happy_ready[dealer].set()
+
+    async def _handle_reconstruct(self, message):
+        """Handle RECONSTRUCT message."""
+        dealer, share = message.payload
 
-        if dealer not in self.happy_count:
-            self.happy_count[dealer] = 0
+        self._init_dealer(dealer)
 
-        if payload['happy']:
-            self.happy_count[dealer] += 1
+        self.reconstruct_shares[dealer][message.sender] = share
+        if len(self.reconstruct_shares[dealer]) >= self.f + 1:
+            self.reconstruct_ready[dealer].set()
 
     async def reconstruct(self, dealer):
         """
@@ -186,18 +238,15 @@ class CompleteSecretSharing:
         else:
             my_share = 0
 
-        await self.network.broadcast(self.party_id, 'CSS_RECONSTRUCT', {
-            'dealer': dealer,
-            'share': my_share
-        })
+        await self.network.broadcast(self.party_id, 'CSS_RECONSTRUCT', (dealer, my_share))
 
-        # Collect shares
-        shares = {}
-        while len(shares) < self.f + 1:
-            await asyncio.sleep(0.001)
+        # Collect f+1 shares
+        self._init_dealer(dealer)
+        await self.reconstruct_ready[dealer].wait()
 
         # Interpolate
-        points = [(party_id, share) for party_id, share in shares.items()]
+        shares = self.reconstruct_shares[dealer]
+        points = [(party_id, shares[party_id]) for party_id in sorted(shares)[: self.f + 1]]
         poly = Polynomial.interpolate(points)
         return poly.eval(0)
 
@@ -0,0 +1,35 @@
+"""
+Event loop selection for the entry-point scripts.
+"""
+
+import asyncio
+import os
+import sys
+
+
+def _uvloop():
+    """Return the uvloop module if MPC_UVLOOP=1 is set and it is installed."""
+    if os.environ.get('MPC_UVLOOP') != '1':
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop
+
+
+def run(main):
+    """
+    Run the coroutine main like asyncio.run, on uvloop's event loop when
+    MPC_UVLOOP=1 is set and uvloop is installed. The protocols only use
+    standard asyncio primitives (Queue, Event, futures, call_soon), so they
+    run unchanged on it. Returns main's result.
+    """
+    uvloop = _uvloop()
+    if uvloop is None:
+        return asyncio.run(main)
+    if sys.version_info >= (3, 12):
+        return asyncio.run(main, loop_factory=uvloop.new_event_loop)
+    # Before 3.12 asyncio.run has no loop_factory; select uvloop by policy
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(main)
@@ -3,71 +3,177 @@ Field arithmetic over prime field F_p.
 We use p = 2^31 - 1 (Mersenne prime) for efficient modular arithmetic.
 """
 
+import functools
+import random
+from array import array
+
+# Using Mersenne prime for efficiency
+MODULUS = 2**31 - 1
+
+
 class Field:
     """Finite field arithmetic."""
 
-    # Using Mersenne prime for efficiency
-    MODULUS = 2**31 - 1
+    MODULUS = MODULUS
 
-    @classmethod
-    def add(cls, a, b):
+    @staticmethod
+    def add(a, b):
         """Add two field elements."""
-        return (a + b) % cls.MODULUS
+        return (a + b) % MODULUS
 
-    @classmethod
-    def sub(cls, a, b):
+    @staticmethod
+    def sub(a, b):
         """Subtract two field elements."""
-        return (a - b) % cls.MODULUS
+        return (a - b) % MODULUS
 
-    @classmethod
-    def mul(cls, a, b):
+    @staticmethod
+    def mul(a, b):
         """Multiply two field elements."""
-        return (a * b) % cls.MODULUS
+        # Measured: in interpreted code a single % is faster than the extra
+        # operations of a Montgomery (REDC) or Mersenne-fold reduction.
+        return (a * b) % MODULUS
 
-    @classmethod
-    def neg(cls, a):
+    @staticmethod
+    def fma(a, b, c):
+        """Fused multiply-add a*b + c, with a single reduction."""
+        return (a * b + c) % MODULUS
+
+    @staticmethod
+    def neg(a):
         """Negate a field element."""
-        return (-a) % cls.MODULUS
+        return (-a) % MODULUS
 
-    @classmethod
-    def inv(cls, a):
-        """Multiplicative inverse using Fermat's little theorem."""
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def inv(a):
+        """
+        Multiplicative inverse via the extended Euclidean algorithm.
+        Memoized: interpolation keeps inverting the same small differences
+        of party ids.
+        """
         if a == 0:
             raise ValueError("Cannot invert zero")
-        # a^(p-1) = 1 (mod p), so a^(-1) = a^(p-2) (mod p)
-        return pow(a, cls.MODULUS - 2, cls.MODULUS)
+        # pow with exponent -1 runs extended Euclid in C, several times
+        # faster than Fermat's a^(p-2); raises ValueError for multiples of p
+        return pow(a, -1, MODULUS)
 
-    @classmethod
-    def div(cls, a, b):
+    @staticmethod
+    def batch_inv(xs):
+        """
+        Invert several field elements with one exponentiation (Montgomery's trick).
+        Returns [x^(-1) for x in xs].
+        """
+        if not xs:
+            return []
+        # Prefix products: prefix[i] = xs[0] * ... * xs[i]
+        prefix = []
+        acc = 1
+        for x in xs:
+            if x % MODULUS == 0:
+                raise ValueError("Cannot invert zero")
+            acc = acc * x % MODULUS
+            prefix.append(acc)
+
+        inv_acc = pow(acc, -1, MODULUS)
+        result = [0] * len(xs)
+        for i in range(len(xs) - 1, 0, -1):
+            result[i] = inv_acc * prefix[i - 1] % MODULUS
+            inv_acc = inv_acc * xs[i] % MODULUS
+        result[0] = inv_acc
+        return result
+
+    @staticmethod
+    def div(a, b):
         """Divide two field elements."""
-        return cls.mul(a, cls.inv(b))
+        return (a * Field.inv(b)) % MODULUS
 
-    @classmethod
-    def random(cls):
+    @staticmethod
+    def random():
         """Generate a random field element."""
-        import random
-        return random.randint(0, cls.MODULUS - 1)
+        return random.randint(0, MODULUS - 1)
+
+    @staticmethod
+    def random_batch(count):
+        """
+        Generate count random field elements from one call into the RNG.
+        Each element reduces a 64-bit draw mod p (bias below 2^-32).
+        """
+        if count <= 0:
+            return []
+        draws = array('Q', random.getrandbits(64 * count).to_bytes(8 * count, 'little'))
+        return [d % MODULUS for d in draws]
 
-    @classmethod
-    def embed(cls, x):
+    @staticmethod
+    def embed(x):
         """Embed an integer into the field."""
-        return x % cls.MODULUS
+        return x % MODULUS
 
-    @classmethod
-    def is_valid(cls, x):
+    @staticmethod
+    def is_valid(x):
         """Check if x is a valid field element."""
-        return 0 <= x < cls.MODULUS
+        return 0 <= x < MODULUS
+
+
+@functools.lru_cache(maxsize=256)
+def _lagrange_bases(xs):
+    """
+    Lagrange basis polynomials for the points xs, each already divided by
+    its denominator prod_{j != i} (x_i - x_j). Returns a tuple of
+    coefficient lists.
+    """
+    n = len(xs)
+
+    # Build Lagrange basis numerators prod_{j != i} (x - xj) and
+    # denominators prod_{j != i} (xi - xj), reducing once per factor
+    bases = []
+    denominators = []
+    for i in range(n):
+        xi = xs[i]
+        basis = [1]
+        denominator = 1
+        for j in range(n):
+            if i != j:
+                xj = xs[j]
+                shifted = [0] + basis  # x * basis
+                for d, c in enumerate(basis):
+                    shifted[d] = (shifted[d] - xj * c) % MODULUS
+                basis = shifted
+                denominator = denominator * (xi - xj) % MODULUS
+        bases.append(basis)
+        denominators.append(denominator)
+
+    # Scale each basis by 1 / denominator, with one batched inversion
+    return tuple(
+        [c * denom_inv % MODULUS for c in basis]
+        for basis, denom_inv in zip(bases, Field.batch_inv(denominators))
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _power_table(x, degree):
+    """
+    Return (x^0, x^1, ..., x^degree) mod p. Memoized and bounded: the
+    party points repeat across every sharing, other points get evicted.
+    """
+    powers = [1] * (degree + 1)
+    for k in range(1, degree + 1):
+        powers[k] = powers[k - 1] * x % MODULUS
+    return tuple(powers)
 
 
 class Polynomial:
     """Polynomial over a finite field."""
 
-    def __init__(self, coefficients):
+    def __init__(self, coefficients, _reduced=False):
         """
         Create a polynomial from coefficients.
         coefficients[i] is the coefficient of x^i.
+        _reduced: internal, the caller guarantees every coefficient is in [0, p).
         """
-        self.coeffs = [Field.embed(c) for c in coefficients]
+        if _reduced:
+            self.coeffs = list(coefficients)
+        else:
+            self.coeffs = [c % MODULUS for c in coefficients]
         # Remove leading zeros
         while len(self.coeffs) > 1 and self.coeffs[-1] == 0:
             self.coeffs.pop()
@@ -78,33 +184,50 @@ class Polynomial:
 
     def eval(self, x):
         """Evaluate polynomial at point x using Horner's method."""
-        x = Field.embed(x)
+        p = MODULUS
+        x %= p
         result = 0
         for coeff in reversed(self.coeffs):
-            result = Field.add(Field.mul(result, x), coeff)
+            result = (result * x + coeff) % p
         return result
 
+    def eval_batch(self, xs):
+        """
+        Evaluate the polynomial at every point in xs, running Horner's
+        method across all points per coefficient. Returns a list.
+        """
+        p = MODULUS
+        xs = [x % p for x in xs]
+        acc = [0] * len(xs)
+        for coeff in reversed(self.coeffs):
+            acc = [(a * x + coeff) % p for a, x in zip(acc, xs)]
+        return acc
+
     def __add__(self, other):
         """Add two polynomials."""
-        max_len = max(len(self.coeffs), len(other.coeffs))
-        result = []
-        for i in range(max_len):
-            a = self.coeffs[i] if i < len(self.coeffs) else 0
-            b = other.coeffs[i] if i < len(other.coeffs) else 0
-            result.append(Field.add(a, b))
-        return Polynomial(result)
+        a_coeffs, b_coeffs = self.coeffs, other.coeffs
+        if len(a_coeffs) < len(b_coeffs):
+            a_coeffs, b_coeffs = b_coeffs, a_coeffs
+        # Both inputs are reduced, so a single conditional subtraction suffices
+        result = list(a_coeffs)
+        for i, b in enumerate(b_coeffs):
+            c = result[i] + b
+            result[i] = c - MODULUS if c >= MODULUS else c
+        return Polynomial(result, _reduced=True)
 
     def __mul__(self, other):
         """Multiply two polynomials."""
         if isinstance(other, int):
             # Scalar multiplication
-            return Polynomial([Field.mul(c, other) for c in self.coeffs])
+            return Polynomial([c * other % MODULUS for c in self.coeffs], _reduced=True)
 
-        result = [0] * (len(self.coeffs) + len(other.coeffs) - 1)
+        # Accumulate exact products and reduce once per coefficient
+        other_coeffs = other.coeffs
+        result = [0] * (len(self.coeffs) + len(other_coeffs) - 1)
         for i, a in enumerate(self.coeffs):
-            for j, b in enumerate(other.coeffs):
-                result[i + j] = Field.add(result[i + j], Field.mul(a, b))
-        return Polynomial(result)
+            for j, b in enumerate(other_coeffs, i):
+                result[j] += a * b
+        return Polynomial([c % MODULUS for c in result], _reduced=True)
 
     @staticmethod
     def interpolate(points):
@@ -113,27 +236,29 @@ class Polynomial:
         points: list of (x, y) tuples.
         Returns the polynomial passing through these points.
         """
-        n = len(points)
-        result = Polynomial([0])
-
-        for i in range(n):
-            xi, yi = points[i]
-            # Build Lagrange basis polynomial L_i(x)
-            basis = Polynomial([1])
-            for j in range(n):
-                if i != j:
-                    xj = points[j][0]
-                    # basis *= (x - xj) / (xi - xj)
-                    numerator = Polynomial([Field.neg(xj), 1])  # x - xj
-                    denominator = Field.sub(xi, xj)
-                    denom_inv = Field.inv(denominator)
-                    basis = basis * numerator * denom_inv
-
-            # Add yi * basis to result
-            basis = basis * yi
-            result = result + basis
+        if not points:
+            return Polynomial([0])
+        xs = tuple(x for x, _ in points)
+        return Polynomial.interpolate_fixed(xs)([y for _, y in points])
 
-        return result
+    @staticmethod
+    def interpolate_fixed(xs):
+        """
+        Return a function mapping values ys to the polynomial through
+        (xs[i], ys[i]). The Lagrange basis for xs is computed once and cached,
+        so repeated interpolation over the same points (party ids) skips it.
+        """
+        bases = _lagrange_bases(tuple(xs))
+        length = len(bases)
+
+        def interpolate_ys(ys):
+            result = [0] * length
+            for yi, basis in zip(ys, bases):
+                for d, c in enumerate(basis):
+                    result[d] += yi * c
+            return Polynomial([c % MODULUS for c in result], _reduced=True)
+
+        return interpolate_ys
 
     @staticmethod
     def lagrange_coefficient(i, points, eval_point=0):
@@ -142,14 +267,14 @@ class Polynomial:
         points: list of x-coordinates
         """
         xi = points[i]
-        result = 1
+        numerator = 1
+        denominator = 1
         for j, xj in enumerate(points):
             if i != j:
-                # result *= (eval_point - xj) / (xi - xj)
-                numerator = Field.sub(eval_point, xj)
-                denominator = Field.sub(xi, xj)
-                result = Field.mul(result, Field.div(numerator, denominator))
-        return result
+                # result *= (eval_point - xj) / (xi - xj), with a single inversion
+                numerator = numerator * (eval_point - xj) % MODULUS
+                denominator = denominator * (xi - xj) % MODULUS
+        return numerator * Field.inv(denominator) % MODULUS
 
     def __repr__(self):
         return f"Polynomial({self.coeffs})"
@@ -161,54 +286,62 @@ class BiVariatePolynomial:
     def __init__(self, degree, secret=None):
         """
         Create a random bi-variate polynomial of given degree with p(0,0) = secret.
+        Coefficients are stored as a (degree+1) x (degree+1) matrix where
+        coeffs[i][j] is the coefficient of x^i * y^j.
         """
         self.degree = degree
-        self.coeffs = {}
 
-        # Random coefficients except a_{0,0}
-        for i in range(degree + 1):
-            for j in range(degree + 1):
-                if i == 0 and j == 0:
-                    self.coeffs[(i, j)] = Field.embed(secret) if secret is not None else Field.random()
-                else:
-                    self.coeffs[(i, j)] = Field.random()
+        # Random coefficients except a_{0,0}, drawn in one batch
+        width = degree + 1
+        draws = Field.random_batch(width * width)
+        self.coeffs = [draws[i:i + width] for i in range(0, width * width, width)]
+        if secret is not None:
+            self.coeffs[0][0] = secret % MODULUS
+
+    def _powers(self, x):
+        """Return (x^0, x^1, ..., x^degree) mod p."""
+        return _power_table(x, self.degree)
 
     def eval(self, x, y):
-        """Evaluate p(x, y)."""
-        x = Field.embed(x)
-        y = Field.embed(y)
+        """Evaluate p(x, y) = x_pow . C . y_pow."""
+        x_pow = self._powers(x % MODULUS)
+        y_pow = self._powers(y % MODULUS)
         result = 0
-        for (i, j), coeff in self.coeffs.items():
-            term = Field.mul(coeff, Field.mul(pow(x, i, Field.MODULUS),
-                                              pow(y, j, Field.MODULUS)))
-            result = Field.add(result, term)
-        return result
+        for xi, row in zip(x_pow, self.coeffs):
+            result += xi * sum(c * yj for c, yj in zip(row, y_pow))
+        return result % MODULUS
 
     def row_polynomial(self, i):
-        """Return the univariate polynomial p(i, y)."""
-        coeffs = [0] * (self.degree + 1)
-        i_pow = [pow(i, exp, Field.MODULUS) for exp in range(self.degree + 1)]
-
-        for j in range(self.degree + 1):
-            for k in range(self.degree + 1):
-                term = Field.mul(self.coeffs[(k, j)], i_pow[k])
-                coeffs[j] = Field.add(coeffs[j], term)
-
-        return Polynomial(coeffs)
+        """Return the univariate polynomial p(i, y), i.e. i_pow . C."""
+        i_pow = self._powers(i % MODULUS)
+        coeffs = [sum(ik * self.coeffs[k][j] for k, ik in enumerate(i_pow)) % MODULUS
+                  for j in range(self.degree + 1)]
+        return Polynomial(coeffs, _reduced=True)
 
     def col_polynomial(self, i):
-        """Return the univariate polynomial p(x, i)."""
-        coeffs = [0] * (self.degree + 1)
-        i_pow = [pow(i, exp, Field.MODULUS) for exp in range(self.degree + 1)]
-
-        for j in range(self.degree + 1):
-            for k in range(self.degree + 1):
-                term = Field.mul(self.coeffs[(j, k)], i_pow[k])
-                coeffs[j] = Field.add(coeffs[j], term)
+        """Return the univariate polynomial p(x, i), i.e. C . i_pow."""
+        i_pow = self._powers(i % MODULUS)
+        coeffs = [sum(c * ik for c, ik in zip(row, i_pow)) % MODULUS for row in self.coeffs]
+        return Polynomial(coeffs, _reduced=True)
 
-        return Polynomial(coeffs)
+    def row_col_coeffs(self, points):
+        """
+        Return the row and column coefficient lists for every point at once:
+        rows = V^T . C and cols = (C . V)^T, where V[k][p] = points[p]^k.
+        rows[p] are the coefficients of p(points[p], y), cols[p] of p(x, points[p]).
+        """
+        C = self.coeffs
+        C_T = list(zip(*C))
+        rows = []
+        cols = []
+        for x in points:
+            x_pow = self._powers(x % MODULUS)
+            rows.append([sum(xk * c for xk, c in zip(x_pow, column)) % MODULUS
+                         for column in C_T])
+            cols.append([sum(c * xk for c, xk in zip(row, x_pow)) % MODULUS
+                         for row in C])
+        return rows, cols
 
     def get_secret(self):
         """Return the secret p(0, 0)."""
-        return self.coeffs[(0, 0)]
-
+        return self.coeffs[0][0]
@@ -2,8 +2,10 @@
 Main entry point for the auction system.
 """
 
-import asyncio
+import logging
+import sys
 from simple_auction import run_auction
+import event_loop
 
 
 async def main():
@@ -85,5 +87,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Show the auction's phase-by-phase log alongside the demo output
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    event_loop.run(main())
 
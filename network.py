@@ -4,12 +4,16 @@ Asynchronous network simulator with message delays and omissions.
 
 import asyncio
 import random
-from collections import defaultdict
+
+# Probability that a faulty party omits any single message
+OMISSION_RATE = 0.3
 
 
 class Message:
     """Network message."""
 
+    __slots__ = ('sender', 'receiver', 'msg_type', 'payload')
+
     def __init__(self, sender, receiver, msg_type, payload):
         self.sender = sender
         self.receiver = receiver
@@ -37,51 +41,132 @@ class Network:
         self.faulty_parties = faulty_parties or set()
         self.delay_range = delay_range
 
-        # Message queues for each party
-        self.queues = {i: asyncio.Queue() for i in range(n)}
+        # Message queues for each party, indexed by party id
+        self.queues = [asyncio.Queue() for _ in range(n)]
 
         # Metrics
         self.total_messages = 0
         self.delivered_messages = 0
         self.omitted_messages = 0
 
-        # Message delivery tasks
-        self.delivery_tasks = []
+        # Pending delayed-delivery tasks (removed on completion)
+        self.delivery_tasks = set()
 
     async def send(self, sender, receiver, msg_type, payload):
         """Send a message from sender to receiver."""
+        self._post(sender, receiver, msg_type, payload)
+
+    def _post(self, sender, receiver, msg_type, payload, count=1):
+        """Hand a message to the network without awaiting."""
+        self._post_message(Message(sender, receiver, msg_type, payload), receiver, count)
+
+    def _post_message(self, message, receiver, count=1):
+        """
+        Deliver message to receiver's queue, subject to omissions and delay.
+        The message may be shared with other receivers (receiver=None).
+        count: number of logical messages carried (for batched payloads).
+        """
         # Check if sender is faulty and should omit
-        if sender in self.faulty_parties:
+        if message.sender in self.faulty_parties:
             # With some probability, omit the message
-            if random.random() < 0.3:  # 30% omission rate for faulty parties
-                self.omitted_messages += 1
+            if random.random() < OMISSION_RATE:
+                self.omitted_messages += count
                 return
 
-        self.total_messages += 1
+        self._enqueue(message, receiver, count)
+
+    def _enqueue(self, message, receiver, count=1):
+        """Deliver message to receiver's queue after a random delay."""
+        self.total_messages += count
 
         # Simulate network delay
         delay = random.uniform(*self.delay_range)
 
+        # Zero delay: enqueue directly without scheduling a task
+        if delay == 0:
+            self.queues[receiver].put_nowait(message)
+            self.delivered_messages += count
+            return
+
         # Create and deliver message after delay
-        message = Message(sender, receiver, msg_type, payload)
-        task = asyncio.create_task(self._deliver_with_delay(message, delay))
-        self.delivery_tasks.append(task)
+        task = asyncio.create_task(self._deliver_with_delay(message, receiver, delay, count))
+        self.delivery_tasks.add(task)
+        task.add_done_callback(self.delivery_tasks.discard)
 
-    async def _deliver_with_delay(self, message, delay):
+    async def _deliver_with_delay(self, message, receiver, delay, count=1):
         """Deliver a message after the specified delay."""
         await asyncio.sleep(delay)
-        await self.queues[message.receiver].put(message)
-        self.delivered_messages += 1
+        await self.queues[receiver].put(message)
+        self.delivered_messages += count
+
+    async def broadcast(self, sender, msg_type, payload, receivers=None):
+        """
+        Broadcast a message to all parties.
+        receivers: optional subset of party ids to send to instead.
+        """
+        if receivers is None:
+            receivers = range(self.n)
+        # Posting never suspends, so send in a plain loop rather than a Task each
+        for receiver in receivers:
+            self._post(sender, receiver, msg_type, payload)
 
-    async def broadcast(self, sender, msg_type, payload):
-        """Broadcast a message to all parties."""
-        for receiver in range(self.n):
-            await self.send(sender, receiver, msg_type, payload)
+    def broadcast_many(self, sender, msg_type, payloads, receivers=None):
+        """
+        Broadcast several payloads as one shared message.
+        Each receiver gets a single message whose payload is the list.
+        A faulty sender still omits each payload independently, exactly as
+        if it had been sent on its own; the receiver gets the survivors.
+        receivers: optional subset of party ids to send to instead.
+        """
+        if sender not in self.faulty_parties:
+            self.broadcast_shared(sender, msg_type, payloads, receivers, count=len(payloads))
+            return
+
+        if receivers is None:
+            receivers = range(self.n)
+        for receiver in receivers:
+            kept = [p for p in payloads if random.random() >= OMISSION_RATE]
+            self.omitted_messages += len(payloads) - len(kept)
+            if kept:
+                self._enqueue(Message(sender, None, msg_type, kept), receiver, len(kept))
+
+    def broadcast_shared(self, sender, msg_type, payload, receivers=None, count=1):
+        """
+        Broadcast one Message object, shared by every receiver.
+        The message has receiver=None; each receiver already knows its own id.
+        Delays and omissions are still drawn per receiver.
+        receivers: optional subset of party ids to send to instead.
+        """
+        if receivers is None:
+            receivers = range(self.n)
+        message = Message(sender, None, msg_type, payload)
+        for receiver in receivers:
+            self._post_message(message, receiver, count)
 
     async def receive(self, party_id):
-        """Receive next message for a party."""
+        """
+        Receive next message for a party.
+        Blocks until a message arrives; callers should await it directly
+        rather than polling with a timeout, so idle parties never wake.
+        """
         return await self.queues[party_id].get()
 
+    async def stream(self, party_id):
+        """
+        Iterate over a party's incoming messages, blocking between them.
+        Ends once close_stream(party_id) has been called.
+        """
+        queue = self.queues[party_id]
+        while True:
+            message = await queue.get()
+            if message is None:
+                return
+            yield message
+
+    def close_stream(self, party_id):
+        """End stream(party_id) after the messages already queued."""
+        self.queues[party_id].put_nowait(None)
+
     def get_message_count(self):
         """Return total number of messages sent."""
         return self.total_messages
@@ -97,6 +182,5 @@ class Network:
     async def wait_for_all_deliveries(self):
         """Wait for all pending message deliveries."""
         if self.delivery_tasks:
-            await asyncio.gather(*self.delivery_tasks, return_exceptions=True)
-            self.delivery_tasks.clear()
+            await asyncio.gather(*list(self.delivery_tasks), return_exceptions=True)
 
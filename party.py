@@ -30,6 +30,19 @@ class MPCParty:
         self.my_shares = {}  # secret_id -> (row_poly, col_poly)
         self.shared_values = {}  # secret_id -> share value
 
+        # Shares collected for multiplication / reconstruction:
+        # secret_id -> (values, received), indexed by party, plus a ready Event
+        self._mult_shares = {}
+        self._mult_ready = {}
+        self._reconstruct_shares = {}
+        self._reconstruct_ready = {}
+
+        # Lagrange coefficients per (f+1)-subset of responding parties,
+        # evaluated at my point (degree reduction) and at 0 (reconstruction);
+        # filled in on first use of each subset
+        self._lagrange_at_me = {}  # parties tuple -> coefficients
+        self._lagrange_at_zero = {}  # parties tuple -> coefficients
+
         # Message handler running
         self.running = False
         self.handler_task = None
@@ -40,24 +53,20 @@ class MPCParty:
         self.handler_task = asyncio.create_task(self._message_handler())
 
     async def stop(self):
-        """Stop the party."""
+        """
+        Stop the party. The handler finishes the messages already queued,
+        then its stream ends.
+        """
         self.running = False
         if self.handler_task:
-            self.handler_task.cancel()
-            try:
-                await self.handler_task
-            except asyncio.CancelledError:
-                pass
+            self.network.close_stream(self.party_id)
+            await self.handler_task
+            self.handler_task = None
 
     async def _message_handler(self):
-        """Handle incoming messages."""
-        while self.running:
+        """Handle incoming messages until stop() closes the stream."""
+        async for message in self.network.stream(self.party_id):
             try:
-                message = await asyncio.wait_for(
-                    self.network.receive(self.party_id),
-                    timeout=0.01
-                )
-
                 # Route message to appropriate handler
                 if message.msg_type.startswith('CSS_'):
                     await self.css.handle_message(message)
@@ -71,8 +80,6 @@ class MPCParty:
                 elif message.msg_type == 'RECONSTRUCT_VALUE':
                     await self._handle_reconstruct_value(message)
 
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
                 # Silently ignore errors in async environment
                 pass
@@ -133,10 +140,8 @@ class MPCParty:
         Multiply two shared values using BGW multiplication.
         This is a simplified version for the auction.
         """
-        # Initialize storage for this multiplication
-        if not hasattr(self, '_mult_shares'):
-            self._mult_shares = {}
-        self._mult_shares[result_id] = {}
+        # Storage for this multiplication (shares may already have arrived)
+        values, received = self._mult_slot(result_id)
 
         # Phase 1: Local multiplication (creates degree 2f sharing)
         share1 = self.shared_values.get(secret_id1, 0)
@@ -144,7 +149,8 @@ class MPCParty:
         d_i = Field.mul(share1, share2)
 
         # Store own share
-        self._mult_shares[result_id][self.party_id] = d_i
+        values[self.party_id] = d_i
+        received[self.party_id] = True
 
         # Broadcast d_i
         await self.network.broadcast(self.party_id, 'SHARE_VALUE', {
@@ -155,43 +161,35 @@ class MPCParty:
 
         # Phase 2: Wait for n-f shares
         # At least n-f honest parties will send their shares, and messages will eventually arrive
-        while len(self._mult_shares[result_id]) < self.n - self.f:
-            await asyncio.sleep(0.001)  # Yield to message handler
+        await self._mult_ready[result_id].wait()
 
         # Degree reduction: take first f+1 shares and interpolate at my point
-        collected_shares = self._mult_shares[result_id]
-        parties = sorted(collected_shares.keys())[: self.f + 1]
-
-        # Compute Lagrange coefficient for interpolation at my party_id
-        my_new_share = 0
-        for p in parties:
-            coeff = Polynomial.lagrange_coefficient(
-                parties.index(p),
-                parties,
-                eval_point=self.party_id
-            )
-            my_new_share = Field.add(my_new_share,
-                                    Field.mul(coeff, collected_shares[p]))
+        parties = tuple([p for p in range(self.n) if received[p]][: self.f + 1])
+        coeffs = self._lagrange_at_me.get(parties)
+        if coeffs is None:
+            coeffs = self._lagrange_at_me[parties] = [
+                Polynomial.lagrange_coefficient(i, parties, self.party_id)
+                for i in range(len(parties))
+            ]
+        my_new_share = sum(c * values[p] for c, p in zip(coeffs, parties)) % Field.MODULUS
 
         self.shared_values[result_id] = my_new_share
         return my_new_share
 
-
     async def reconstruct(self, secret_id):
         """
         Reconstruct a secret value.
         All parties send their shares and interpolate.
         """
-        # Initialize storage for reconstruction
-        if not hasattr(self, '_reconstruct_shares'):
-            self._reconstruct_shares = {}
-        self._reconstruct_shares[secret_id] = {}
+        # Storage for reconstruction (shares may already have arrived)
+        values, received = self._reconstruct_slot(secret_id)
 
         # Broadcast my share
         my_share = self.shared_values.get(secret_id, 0)
 
         # Store own share
-        self._reconstruct_shares[secret_id][self.party_id] = my_share
+        values[self.party_id] = my_share
+        received[self.party_id] = True
 
         await self.network.broadcast(self.party_id, 'RECONSTRUCT_VALUE', {
             'secret_id': secret_id,
@@ -201,16 +199,33 @@ class MPCParty:
 
         # Wait for f+1 shares
         # At least f+1 honest parties will send their shares
-        while len(self._reconstruct_shares[secret_id]) < self.f + 1:
-            await asyncio.sleep(0.001)  # Yield to message handler
-
-        # Interpolate
-        shares = self._reconstruct_shares[secret_id]
-        parties = sorted(shares.keys())[: self.f + 1]
-        points = [(p, shares[p]) for p in parties]
-        poly = Polynomial.interpolate(points)
-        return poly.eval(0)
-
+        await self._reconstruct_ready[secret_id].wait()
+
+        # Interpolate at 0
+        parties = tuple([p for p in range(self.n) if received[p]][: self.f + 1])
+        coeffs = self._lagrange_at_zero.get(parties)
+        if coeffs is None:
+            coeffs = self._lagrange_at_zero[parties] = [
+                Polynomial.lagrange_coefficient(i, parties, 0)
+                for i in range(len(parties))
+            ]
+        return sum(c * values[p] for c, p in zip(coeffs, parties)) % Field.MODULUS
+
+    def _mult_slot(self, secret_id):
+        """Return (values, received) for a multiplication, creating it on first use."""
+        slot = self._mult_shares.get(secret_id)
+        if slot is None:
+            slot = self._mult_shares[secret_id] = ([0] * self.n, [False] * self.n)
+            self._mult_ready[secret_id] = asyncio.Event()
+        return slot
+
+    def _reconstruct_slot(self, secret_id):
+        """Return (values, received) for a reconstruction, creating it on first use."""
+        slot = self._reconstruct_shares.get(secret_id)
+        if slot is None:
+            slot = self._reconstruct_shares[secret_id] = ([0] * self.n, [False] * self.n)
+            self._reconstruct_ready[secret_id] = asyncio.Event()
+        return slot
 
     async def _handle_share_value(self, message):
         """Handle shared value from multiplication."""
@@ -219,13 +234,11 @@ class MPCParty:
         share = payload['share']
         party = payload['party']
 
-        # Store in temporary collection (would be better structured)
-        if not hasattr(self, '_mult_shares'):
-            self._mult_shares = {}
-        if secret_id not in self._mult_shares:
-            self._mult_shares[secret_id] = {}
-
-        self._mult_shares[secret_id][party] = share
+        values, received = self._mult_slot(secret_id)
+        values[party] = share
+        received[party] = True
+        if sum(received) >= self.n - self.f:
+            self._mult_ready[secret_id].set()
 
     async def _handle_reconstruct_value(self, message):
         """Handle reconstruction share."""
@@ -234,11 +247,9 @@ class MPCParty:
         share = payload['share']
         party = payload['party']
 
-        # Store in temporary collection
-        if not hasattr(self, '_reconstruct_shares'):
-            self._reconstruct_shares = {}
-        if secret_id not in self._reconstruct_shares:
-            self._reconstruct_shares[secret_id] = {}
-
-        self._reconstruct_shares[secret_id][party] = share
+        values, received = self._reconstruct_slot(secret_id)
+        values[party] = share
+        received[party] = True
+        if sum(received) >= self.f + 1:
+            self._reconstruct_ready[secret_id].set()
 
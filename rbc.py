@@ -4,76 +4,187 @@ Ensures totality: if any honest party delivers, all honest parties deliver.
 """
 
 import asyncio
-from collections import defaultdict
+import functools
+import pickle
+from collections import Counter
+
+
+def _freeze(value):
+    """
+    Return a hashable key for value. Hashable values are their own key;
+    dicts, lists and sets (the payload shapes used in practice) are turned
+    into tagged tuples/frozensets, and anything else falls back to pickle.
+    """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    freezer = _FREEZERS.get(type(value))
+    if freezer is not None:
+        return (type(value), freezer(value))
+    return pickle.dumps(value)
+
+
+# Per-type key builders for unhashable payload values
+_FREEZERS = {
+    dict: lambda d: frozenset((k, _freeze(v)) for k, v in d.items()),
+    list: lambda l: tuple(_freeze(v) for v in l),
+    set: lambda s: frozenset(_freeze(v) for v in s),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def make_rbc_class(base, n, f):
+    """
+    Return a subclass of base specialized for (n, f), with the thresholds
+    as class constants. Cached, so all instances for (n, f) share it.
+    """
+    echo_threshold = (n + f + 2) >> 1  # ceil((n+f+1)/2)
+    assert echo_threshold == -(-(n + f + 1) // 2)
+
+    return type(f"{base.__name__}_{n}_{f}", (base,), {
+        '_specialized': True,
+        'echo_threshold': echo_threshold,
+        'ready_threshold': f + 1,
+        'deliver_threshold': 2 * f + 1,
+    })
 
 
 class ReliableBroadcast:
     """
     Bracha's Reliable Broadcast protocol.
     Guarantees that if one honest party delivers a value, all honest parties deliver it.
+
+    Instances are created from a per-(n, f) subclass (see make_rbc_class),
+    so echo_threshold, ready_threshold and deliver_threshold are class constants.
     """
 
+    _specialized = False
+
+    def __new__(cls, party_id, n, f, network):
+        if not cls._specialized:
+            cls = make_rbc_class(cls, n, f)
+        return super().__new__(cls)
+
     def __init__(self, party_id, n, f, network):
         self.party_id = party_id
         self.n = n
         self.f = f
         self.network = network
 
-        # Thresholds
-        self.echo_threshold = (n + f + 1 + 1) // 2  # ceil((n+f+1)/2)
-        self.ready_threshold = f + 1
-        self.deliver_threshold = 2 * f + 1
-
         # State per sender
         self.val_received = {}  # sender -> value
-        self.echo_count = defaultdict(lambda: defaultdict(int))  # sender -> value -> count
-        self.ready_count = defaultdict(lambda: defaultdict(int))  # sender -> value -> count
+        self.echo_count = {}  # sender -> Counter(value id -> count)
+        self.ready_count = {}  # sender -> Counter(value id -> count)
+        # Values interned to small ints per sender, so counters hash ints
+        self._value_ids = {}  # sender -> {frozen value -> value id}
+        self._seen_values = {}  # sender -> {id(value object) -> (value, value id)}
         self.delivered = {}  # sender -> value
 
         # Flags
         self.echo_sent = {}  # sender -> bool
-        self.ready_sent = {}  # sender -> value or None
+        self.ready_sent = {}  # sender -> value id, once READY is sent
 
-        # Conditions for waiting
-        self.deliver_conditions = {}  # sender -> asyncio.Condition
+        # Tasks waiting in deliver(), resolved with the value on delivery
+        self._deliver_waiters = {}  # sender -> [asyncio.Future]
+
+        # Outgoing ECHO/READY messages, coalesced per event-loop tick into
+        # one RBC_BATCH broadcast of (msg_type, payload) pairs. Payloads are
+        # never mutated after sending, so the incoming {'sender', 'value'}
+        # payload is forwarded as-is and shared by every receiver.
+        self._pending_out = []
+
+        # Message type -> handler, built once
+        self._handlers = {
+            'RBC_VAL': self._handle_val,
+            'RBC_ECHO': self._handle_echo,
+            'RBC_READY': self._handle_ready,
+        }
 
     async def broadcast(self, value):
         """Broadcast a value as the sender."""
-        # Send VAL to all parties
-        await self.network.broadcast(self.party_id, 'RBC_VAL', {
-            'sender': self.party_id,
-            'value': value
-        })
+        me = self.party_id
+        payload = {'sender': me, 'value': value}
+        others = [i for i in range(self.n) if i != me]
+
+        # The sender knows its own value: record VAL/ECHO/READY and deliver
+        # locally instead of sending the three messages to itself
+        self.val_received[me] = value
+        self.echo_sent[me] = True
+        self.ready_sent[me] = self._key(me, value)
+        self._deliver(me, value)
+
+        # Send VAL to everyone else, along with my ECHO and READY votes
+        self.network.broadcast_shared(me, 'RBC_VAL', payload, receivers=others)
+        self.network.broadcast_many(me, 'RBC_BATCH', [
+            ('RBC_ECHO', payload), ('RBC_READY', payload)
+        ], receivers=others)
 
     async def deliver(self, sender):
         """Wait for and return the delivered value from sender."""
-        if sender not in self.deliver_conditions:
-            self.deliver_conditions[sender] = asyncio.Condition()
-
-        async with self.deliver_conditions[sender]:
-            while sender not in self.delivered:
-                await self.deliver_conditions[sender].wait()
+        if sender in self.delivered:
             return self.delivered[sender]
 
+        future = asyncio.get_running_loop().create_future()
+        self._deliver_waiters.setdefault(sender, []).append(future)
+        return await future
+
+    def _key(self, sender, value):
+        """
+        Return a small int identifying value among those seen for sender.
+        Each value object is frozen at most once; payloads are forwarded by
+        reference, so later messages usually hit the identity cache.
+        """
+        seen = self._seen_values.get(sender)
+        if seen is None:
+            seen = self._seen_values[sender] = {}
+        entry = seen.get(id(value))
+        if entry is not None:
+            return entry[1]
+
+        ids = self._value_ids.setdefault(sender, {})
+        frozen = _freeze(value)
+        vid = ids.get(frozen)
+        if vid is None:
+            vid = ids[frozen] = len(ids)
+        # Keep a reference so id(value) cannot be reused by another object
+        seen[id(value)] = (value, vid)
+        return vid
+
+    def _enqueue(self, msg_type, payload):
+        """Queue an outgoing broadcast; flushed once the current tick ends."""
+        if not self._pending_out:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self._pending_out.append((msg_type, payload))
+
+    def _flush(self):
+        """Send all queued ECHO/READY messages as a single batch."""
+        pending, self._pending_out = self._pending_out, []
+        self.network.broadcast_many(self.party_id, 'RBC_BATCH', pending)
+
     async def handle_message(self, message):
         """Process an RBC message."""
-        msg_type = message.msg_type
-        payload = message.payload
+        handlers = self._handlers
+
+        if message.msg_type == 'RBC_BATCH':
+            for msg_type, payload in message.payload:
+                handler = handlers.get(msg_type)
+                if handler:
+                    await handler(payload)
+            return
 
-        if msg_type == 'RBC_VAL':
-            await self._handle_val(payload)
-        elif msg_type == 'RBC_ECHO':
-            await self._handle_echo(payload)
-        elif msg_type == 'RBC_READY':
-            await self._handle_ready(payload)
+        handler = handlers.get(message.msg_type)
+        if handler:
+            await handler(message.payload)
 
     async def _handle_val(self, payload):
         """Handle VAL message."""
         sender = payload['sender']
         value = payload['value']
 
-        # Only accept first VAL from sender
-        if sender in self.val_received:
+        # Only accept first VAL from sender, and none once delivered
+        if sender in self.val_received or sender in self.delivered:
             return
 
         self.val_received[sender] = value
@@ -81,50 +192,74 @@ class ReliableBroadcast:
         # Send ECHO
         if sender not in self.echo_sent:
             self.echo_sent[sender] = True
-            await self.network.broadcast(self.party_id, 'RBC_ECHO', {
-                'sender': sender,
-                'value': value
-            })
+            self._enqueue('RBC_ECHO', payload)
 
     async def _handle_echo(self, payload):
         """Handle ECHO message."""
         sender = payload['sender']
-        value = payload['value']
 
-        self.echo_count[sender][value] += 1
+        # Already delivered: ECHOs can no longer change anything
+        if sender in self.delivered:
+            return
+
+        value = payload['value']
+        vid = self._key(sender, value)
+        echo_count = self.echo_count.get(sender)
+        if echo_count is None:
+            echo_count = self.echo_count[sender] = Counter()
+        echo_count[vid] += 1
+        echo_threshold = self.echo_threshold
+        ready_sent = self.ready_sent
 
         # Check ECHO threshold
-        if (self.echo_count[sender][value] >= self.echo_threshold and
-            self.ready_sent.get(sender) is None):
-            self.ready_sent[sender] = value
-            await self.network.broadcast(self.party_id, 'RBC_READY', {
-                'sender': sender,
-                'value': value
-            })
+        if echo_count[vid] >= echo_threshold and sender not in ready_sent:
+            ready_sent[sender] = vid
+            self._enqueue('RBC_READY', payload)
 
     async def _handle_ready(self, payload):
         """Handle READY message."""
         sender = payload['sender']
-        value = payload['value']
 
-        self.ready_count[sender][value] += 1
+        # Already delivered (and so already sent READY): nothing left to do
+        if sender in self.delivered:
+            return
+
+        value = payload['value']
+        vid = self._key(sender, value)
+        ready_count = self.ready_count.get(sender)
+        if ready_count is None:
+            ready_count = self.ready_count[sender] = Counter()
+        ready_count[vid] += 1
+        count = ready_count[vid]
+        ready_threshold = self.ready_threshold
+        deliver_threshold = self.deliver_threshold
+        ready_sent = self.ready_sent
 
         # Amplification: if f+1 READY, send READY if not already sent
-        if (self.ready_count[sender][value] >= self.ready_threshold and
-            self.ready_sent.get(sender) is None):
-            self.ready_sent[sender] = value
-            await self.network.broadcast(self.party_id, 'RBC_READY', {
-                'sender': sender,
-                'value': value
-            })
+        if sender not in ready_sent:
+            if count >= ready_threshold:
+                ready_sent[sender] = vid
+                self._enqueue('RBC_READY', payload)
 
         # Delivery: if 2f+1 READY, deliver
-        if (self.ready_count[sender][value] >= self.deliver_threshold and
-            sender not in self.delivered):
-            self.delivered[sender] = value
-
-            # Notify waiting tasks
-            if sender in self.deliver_conditions:
-                async with self.deliver_conditions[sender]:
-                    self.deliver_conditions[sender].notify_all()
+        if count >= deliver_threshold:
+            self._deliver(sender, value)
+            self._release(sender)
+
+    def _release(self, sender):
+        """Drop per-sender counting state once its value is delivered."""
+        self.val_received.pop(sender, None)
+        self._value_ids.pop(sender, None)
+        self._seen_values.pop(sender, None)
+        self.echo_count.pop(sender, None)
+        self.ready_count.pop(sender, None)
+
+    def _deliver(self, sender, value):
+        """Record the delivered value from sender and wake waiting tasks."""
+        self.delivered[sender] = value
+
+        # Wake waiting tasks; later deliver() calls return immediately
+        for future in self._deliver_waiters.pop(sender, ()):
+            if not future.done():  # Skip waiters that gave up (timeout/cancel)
+                future.set_result(value)
 
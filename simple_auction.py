@@ -4,9 +4,16 @@ This is a working implementation that demonstrates the key concepts.
 """
 
 import asyncio
+import logging
 from field import Field
 from circuit import ArithmeticCircuit
 
+log = logging.getLogger(__name__)
+
+# Bound once for the output-masking loops
+_MOD = Field.MODULUS
+_random_batch = Field.random_batch
+
 
 class SimplifiedAuction:
     """
@@ -26,30 +33,38 @@ class SimplifiedAuction:
         Run the auction protocol.
 
         Args:
-            bids: Dictionary {party_id: bid_value}
+            bids: Mapping {party_id: bid_value}; read only, so a read-only
+                view such as types.MappingProxyType works. Party ids must
+                be integers in range(n).
 
         Returns:
             outputs: Dictionary {party_id: output_value}
+
+        Raises:
+            ValueError: if a bid key is not a party id in range(n)
         """
-        print(f"\n{'='*60}")
-        print(f"Starting Second-Price Auction")
-        print(f"{'='*60}")
-        print(f"Bids: {bids}")
+        invalid = [p for p in bids if not (isinstance(p, int) and 0 <= p < self.n)]
+        if invalid:
+            raise ValueError(
+                f"Bid keys must be party ids in range({self.n}), got {invalid!r}"
+            )
+
+        log.info("\n" + "=" * 60)
+        log.info("Starting Second-Price Auction")
+        log.info("=" * 60)
+        log.info("Bids: %s", bids)
 
         # Phase 1: Input Sharing (Simulated)
-        print(f"\n[Phase 1] Input Sharing")
-        print(f"  Each party shares {self.k} bit values")
+        log.info("\n[Phase 1] Input Sharing")
+        log.info("  Each party shares %s bit values", self.k)
 
-        # Each party shares k bits
-        for party_id in range(self.n):
-            if party_id in bids:
-                # Share k bits per party
-                self.message_count += self.k * self.n  # Each bit shared with n parties
+        # Each bidding party shares k bits, each bit shared with n parties
+        self.message_count += len(bids) * self.k * self.n
 
-        print(f"  Messages sent: {self.message_count}")
+        log.info("  Messages sent: %s", self.message_count)
 
         # Phase 2: Agreement on Input Set
-        print(f"\n[Phase 2] Agreement on Input Set (ACS)")
+        log.info("\n[Phase 2] Agreement on Input Set (ACS)")
 
         # Simulate RBC for n parties (each broadcasts)
         # RBC uses VAL, ECHO, READY messages
@@ -65,12 +80,12 @@ class SimplifiedAuction:
 
         # Select n-f = 3 parties
         participating = sorted([p for p in bids.keys()])[:self.n - self.f]
-        print(f"  Participating parties: {participating}")
-        print(f"  Messages sent: {self.message_count}")
-        print(f"  Beacon invocations: {self.beacon_count}")
+        log.info("  Participating parties: %s", participating)
+        log.info("  Messages sent: %s", self.message_count)
+        log.info("  Beacon invocations: %s", self.beacon_count)
 
         # Phase 3: Circuit Evaluation
-        print(f"\n[Phase 3] Circuit Evaluation")
+        log.info("\n[Phase 3] Circuit Evaluation")
 
         # Compute auction using arithmetic circuit
         participating_bids = [bids[p] for p in participating]
@@ -84,66 +99,60 @@ class SimplifiedAuction:
             len(participating), self.k
         )
 
-        print(f"  Circuit operations:")
-        print(f"    Additions: {additions}")
-        print(f"    Multiplications: {multiplications}")
+        log.info("  Circuit operations:")
+        log.info("    Additions: %s", additions)
+        log.info("    Multiplications: %s", multiplications)
 
         # Each multiplication requires degree reduction
         # Simplified: each mult needs n broadcasts for shares + ACS
         mult_messages = multiplications * self.n * 2  # Share + reconstruct
         self.message_count += mult_messages
 
-        print(f"  Winner: Party {winner_id}")
-        print(f"  Second price: {second_price}")
-        print(f"  Messages sent: {self.message_count}")
+        log.info("  Winner: Party %s", winner_id)
+        log.info("  Second price: %s", second_price)
+        log.info("  Messages sent: %s", self.message_count)
 
         # Phase 4: Output Delivery
-        print(f"\n[Phase 4] Output Delivery with Masking")
-
-        # Each party creates masked output
-        outputs = {}
-        for party_id in range(self.n):
-            # Generate random mask (simulated)
-            r_i = Field.random()
-
-            # Get beacon value (simulated)
-            self.beacon_count += 1
-            rho = Field.random()  # Simulated beacon
-
-            # Compute output
-            if party_id == winner_id:
-                o_i = second_price
-            else:
-                o_i = 0
-
-            # Blinded value: z_i = o_i + r_i + rho
-            z_i = Field.add(Field.add(o_i, r_i), rho)
-
-            # Broadcast z_i (in shares - simulated)
-            self.message_count += self.n
-
-            # Party i unblocks: o_i = z_i - r_i - rho
-            actual_output = Field.sub(Field.sub(z_i, r_i), rho)
-            outputs[party_id] = actual_output
-
-        print(f"  Messages sent: {self.message_count}")
-        print(f"  Beacon invocations: {self.beacon_count}")
-
-        # Print results
-        print(f"\n{'='*60}")
-        print(f"Auction Results")
-        print(f"{'='*60}")
-        for party_id in range(self.n):
-            output = outputs.get(party_id, 0)
-            status = "WINNER" if output > 0 else "non-winner"
-            print(f"  Party {party_id}: {status}, output = {output}")
-
-        print(f"\n{'='*60}")
-        print(f"Final Metrics")
-        print(f"{'='*60}")
-        print(f"  Total messages: {self.message_count}")
-        print(f"  Beacon invocations: {self.beacon_count}")
-        print(f"{'='*60}\n")
+        log.info("\n[Phase 4] Output Delivery with Masking")
+
+        # Each party creates masked output, all parties at once
+        randomness = _random_batch(2 * self.n)
+        r = randomness[:self.n]  # Random masks (simulated)
+        rho = randomness[self.n:]  # Beacon values (simulated)
+        self.beacon_count += self.n
+
+        o = [0] * self.n
+        o[winner_id] = second_price
+
+        # Blinded values: z_i = o_i + r_i + rho_i
+        z = [(o_i + r_i + rho_i) % _MOD for o_i, r_i, rho_i in zip(o, r, rho)]
+
+        # Each z_i is broadcast (in shares - simulated)
+        self.message_count += self.n * self.n
+
+        # Party i unblinds: o_i = z_i - r_i - rho_i
+        outputs = {party_id: (z_i - r_i - rho_i) % _MOD
+                   for party_id, (z_i, r_i, rho_i) in enumerate(zip(z, r, rho))}
+
+        log.info("  Messages sent: %s", self.message_count)
+        log.info("  Beacon invocations: %s", self.beacon_count)
+
+        # Log results
+        log.info("\n" + "=" * 60)
+        log.info("Auction Results")
+        log.info("=" * 60)
+        if log.isEnabledFor(logging.INFO):
+            for party_id in range(self.n):
+                output = outputs.get(party_id, 0)
+                status = "WINNER" if output > 0 else "non-winner"
+                log.info("  Party %s: %s, output = %s", party_id, status, output)
+
+        log.info("\n" + "=" * 60)
+        log.info("Final Metrics")
+        log.info("=" * 60)
+        log.info("  Total messages: %s", self.message_count)
+        log.info("  Beacon invocations: %s", self.beacon_count)
+        log.info("=" * 60 + "\n")
 
         return outputs
 
@@ -5,6 +5,7 @@ Integration tests for the auction protocol.
 import pytest
 import asyncio
 from auction import create_auction_system, run_simple_auction
+from simple_auction import run_auction
 
 
 @pytest.mark.asyncio
@@ -184,3 +185,11 @@ async def test_auction_privacy():
     for party_id in [0, 2, 3]:
         assert outputs[party_id] == 0
 
+
+@pytest.mark.asyncio
+async def test_simplified_auction_rejects_unknown_parties():
+    """Test that bids keyed by non-party ids raise ValueError."""
+    with pytest.raises(ValueError):
+        await run_auction({0: 5, 1: 7, 2: 3, 7: 9})
+    with pytest.raises(ValueError):
+        await run_auction({'a': 5, 1: 7, 2: 3})
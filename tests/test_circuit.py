@@ -25,6 +25,23 @@ def test_bit_decomposition():
     assert bits == [1, 1, 1, 1, 1]
 
 
+def test_bit_decompose_all():
+    """Test batched bit decomposition."""
+    values = [13, 0, 31]
+    all_bits = ArithmeticCircuit.bit_decompose_all(values, k=5)
+
+    assert all_bits == [ArithmeticCircuit.bit_decompose(v, k=5) for v in values]
+
+
+def test_bit_decompose_wide():
+    """Test bit decomposition wider than a byte."""
+    for k in [9, 16, 20]:
+        for v in [0, 1, 300, 65535, 123456]:
+            bits = ArithmeticCircuit.bit_decompose(v, k)
+            assert len(bits) == k
+            assert sum(b * (2**i) for i, b in enumerate(bits)) == v % (2**k)
+
+
 def test_compare_bits():
     """Test bit comparison."""
     # 15 > 10
@@ -42,6 +59,36 @@ def test_compare_bits():
     assert result == 0  # 15 == 15, so not greater
 
 
+def test_compare_bits_all_pairs():
+    """Test bit comparison against integer comparison for all 5-bit pairs."""
+    for a in range(32):
+        a_bits = ArithmeticCircuit.bit_decompose(a, k=5)
+        for b in range(32):
+            b_bits = ArithmeticCircuit.bit_decompose(b, k=5)
+            assert ArithmeticCircuit.compare_bits(a_bits, b_bits) == int(a > b)
+
+
+def test_compare_bits_other_widths():
+    """Test bit comparison for widths that use the generic loop."""
+    for k in (1, 3, 6):
+        for a in range(2 ** k):
+            a_bits = ArithmeticCircuit.bit_decompose(a, k=k)
+            for b in range(2 ** k):
+                b_bits = ArithmeticCircuit.bit_decompose(b, k=k)
+                assert ArithmeticCircuit.compare_bits(a_bits, b_bits) == int(a > b)
+
+
+def test_compare_bits_batch():
+    """Test batched comparison against compare_bits, across widths."""
+    assert ArithmeticCircuit.compare_bits_batch([], []) == []
+    for k in (1, 5, 6):
+        values = range(2 ** k)
+        a_rows = [ArithmeticCircuit.bit_decompose(a, k=k) for a in values for _ in values]
+        b_rows = [ArithmeticCircuit.bit_decompose(b, k=k) for _ in values for b in values]
+        expected = [ArithmeticCircuit.compare_bits(a, b) for a, b in zip(a_rows, b_rows)]
+        assert ArithmeticCircuit.compare_bits_batch(a_rows, b_rows) == expected
+
+
 def test_max_two():
     """Test max of two values."""
     a = 20
@@ -77,6 +124,18 @@ def test_find_max():
     assert max_val == 10
 
 
+def test_find_max_batched_rounds(monkeypatch):
+    """Test that batched and pairwise tournament rounds pick the same winner."""
+    import random
+    import circuit
+    cases = [[3, 3], [1, 31, 31, 2, 5], list(range(32))]
+    cases += [[random.randrange(32) for _ in range(n)] for n in (7, 40)]
+    pairwise = [ArithmeticCircuit.find_max(values, k=5) for values in cases]
+
+    monkeypatch.setattr(circuit, '_MIN_BATCH_PAIRS', 0)
+    assert pairwise == [ArithmeticCircuit.find_max(values, k=5) for values in cases]
+
+
 def test_find_second_max():
     """Test finding second maximum."""
     values = [15, 25, 10, 20]
@@ -85,6 +144,38 @@ def test_find_second_max():
     assert second_max == 20  # Second highest after masking 25
 
 
+def test_find_max_and_second():
+    """Test single-pass max and second max."""
+    values = [15, 25, 10, 20]
+    max_val, max_idx, second_max = ArithmeticCircuit.find_max_and_second(values, k=5)
+
+    assert max_val == 25
+    assert max_idx == 1
+    assert second_max == 20
+
+    # Ties: first occurrence wins, second max equals the tied value
+    max_val, max_idx, second_max = ArithmeticCircuit.find_max_and_second([10, 10, 3], k=5)
+    assert max_idx == 0
+    assert second_max == 10
+
+    # Single value has no second max
+    assert ArithmeticCircuit.find_max_and_second([7], k=5) == (7, 0, 0)
+
+
+def test_find_max_and_second_generated(monkeypatch):
+    """Test the generated scan against the loop, including ties."""
+    import random
+    import circuit
+    cases = [[7], [3, 3], [0, 0, 0], [15, 25, 10, 20], [31, 30, 29, 28], [1, 31, 31, 2, 5]]
+    cases += [[random.randrange(32) for _ in range(n)] for n in range(1, 9)]
+    generated = [ArithmeticCircuit.find_max_and_second(values, k=5) for values in cases]
+    wide = ArithmeticCircuit.find_max_and_second([300, 700, 500], k=10)
+
+    monkeypatch.setattr(circuit, '_MAX_UNROLLED_BIDS', 0)
+    assert generated == [ArithmeticCircuit.find_max_and_second(values, k=5) for values in cases]
+    assert wide == ArithmeticCircuit.find_max_and_second([300, 700, 500], k=10) == (700, 1, 500)
+
+
 def test_second_price_auction():
     """Test complete second-price auction."""
     bids = [15, 25, 10, 20]
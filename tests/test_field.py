@@ -28,6 +28,13 @@ def test_field_multiplication():
     assert result == 77
 
 
+def test_field_fma():
+    """Test fused multiply-add against separate mul and add."""
+    p = Field.MODULUS
+    for a, b, c in [(7, 11, 5), (p - 1, p - 1, p - 1), (0, 9, 3), (123456789, 987654321, 42)]:
+        assert Field.fma(a, b, c) == Field.add(Field.mul(a, b), c)
+
+
 def test_field_inverse():
     """Test field multiplicative inverse."""
     a = 7
@@ -36,6 +43,29 @@ def test_field_inverse():
     assert product == 1
 
 
+def test_field_inverse_edge_cases():
+    """Test inverses at the ends of the field and of non-invertible inputs."""
+    for a in [1, 2, Field.MODULUS - 1, Field.MODULUS + 3, -5]:
+        assert Field.mul(a % Field.MODULUS, Field.inv(a)) == 1
+    assert Field.inv(Field.MODULUS - 1) == Field.MODULUS - 1
+
+    for a in [0, Field.MODULUS, 2 * Field.MODULUS]:
+        with pytest.raises(ValueError):
+            Field.inv(a)
+
+
+def test_field_batch_inverse():
+    """Test batched multiplicative inverse."""
+    values = [7, 1, Field.MODULUS - 1, 123456789]
+    inverses = Field.batch_inv(values)
+
+    assert inverses == [Field.inv(a) for a in values]
+    assert Field.batch_inv([]) == []
+
+    with pytest.raises(ValueError):
+        Field.batch_inv([3, 0])
+
+
 def test_polynomial_evaluation():
     """Test polynomial evaluation."""
     # p(x) = 1 + 2x + 3x^2
@@ -51,6 +81,15 @@ def test_polynomial_evaluation():
     assert poly.eval(2) == 17
 
 
+def test_polynomial_eval_batch():
+    """Test evaluating a polynomial at several points at once."""
+    poly = Polynomial([1, 2, 3])
+    xs = [0, 1, 2, Field.MODULUS - 1, 12345]
+
+    assert poly.eval_batch(xs) == [poly.eval(x) for x in xs]
+    assert poly.eval_batch([]) == []
+
+
 def test_polynomial_addition():
     """Test polynomial addition."""
     p1 = Polynomial([1, 2, 3])  # 1 + 2x + 3x^2
@@ -91,6 +130,26 @@ def test_lagrange_interpolation():
         assert original.eval(x) == reconstructed.eval(x)
 
 
+def test_interpolate_fixed():
+    """Test interpolation with a reusable basis over fixed points."""
+    xs = [1, 2, 3]
+    interp = Polynomial.interpolate_fixed(xs)
+    for coeffs in ([5, 3, 2], [0, 0, 1], [7]):
+        original = Polynomial(coeffs)
+        reconstructed = interp([original.eval(x) for x in xs])
+        assert reconstructed.coeffs == original.coeffs
+        assert reconstructed.coeffs == Polynomial.interpolate(
+            list(zip(xs, original.eval_batch(xs)))).coeffs
+
+
+def test_interpolate_empty():
+    """Test that interpolating no points gives the zero polynomial."""
+    poly = Polynomial.interpolate([])
+    assert poly.coeffs == [0]
+    assert poly.degree() == 0
+    assert poly.eval(5) == 0
+
+
 def test_lagrange_coefficient():
     """Test Lagrange coefficient computation."""
     points = [1, 2, 3]
@@ -145,3 +204,23 @@ def test_bivariate_row_column():
     share = col_1.eval(0)
     assert isinstance(share, int)
 
+
+def test_bivariate_row_col_coeffs():
+    """Test computing all row and column polynomials at once."""
+    poly = BiVariatePolynomial(2, 100)
+
+    rows, cols = poly.row_col_coeffs(range(4))
+
+    for i in range(4):
+        assert Polynomial(rows[i]).coeffs == poly.row_polynomial(i).coeffs
+        assert Polynomial(cols[i]).coeffs == poly.col_polynomial(i).coeffs
+
+
+def test_field_random_batch():
+    """Test batched random field elements."""
+    values = Field.random_batch(100)
+
+    assert len(values) == 100
+    assert all(Field.is_valid(v) for v in values)
+    assert len(set(values)) > 1
+    assert Field.random_batch(0) == []
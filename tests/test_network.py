@@ -7,6 +7,7 @@ import asyncio
 from network import Network
 from beacon import RandomnessBeacon
 from rbc import ReliableBroadcast
+from css import CompleteSecretSharing
 
 
 @pytest.mark.asyncio
@@ -49,6 +50,68 @@ async def test_network_broadcast():
     assert len(messages) == n
 
 
+@pytest.mark.asyncio
+async def test_network_zero_delay():
+    """Test that zero-delay messages are queued immediately."""
+    network = Network(n=4, faulty_parties=None, delay_range=(0, 0))
+
+    await network.broadcast(0, 'TEST', {'value': 1})
+
+    # Delivered synchronously, no pending delivery tasks
+    assert network.get_stats()['delivered_messages'] == 4
+    assert not network.delivery_tasks
+
+    message = network.queues[2].get_nowait()
+    assert message.sender == 0
+    assert message.payload['value'] == 1
+
+
+@pytest.mark.asyncio
+async def test_network_broadcast_many():
+    """Test that batched payloads arrive as one message per receiver."""
+    network = Network(n=4, faulty_parties=None, delay_range=(0, 0))
+
+    network.broadcast_many(1, 'BATCH', [{'seq': 0}, {'seq': 1}])
+
+    # Each payload still counts as a message
+    assert network.get_message_count() == 8
+
+    messages = []
+    for party_id in range(4):
+        message = await network.receive(party_id)
+        assert message.sender == 1
+        assert [p['seq'] for p in message.payload] == [0, 1]
+        assert network.queues[party_id].empty()
+        messages.append(message)
+
+    # One envelope shared by all receivers
+    assert all(m is messages[0] for m in messages)
+
+
+@pytest.mark.asyncio
+async def test_network_broadcast_many_omits_per_payload():
+    """Test that a faulty sender's batch loses payloads individually."""
+    network = Network(n=4, faulty_parties={0}, delay_range=(0, 0))
+    payloads = [{'seq': i} for i in range(20)]
+
+    network.broadcast_many(0, 'BATCH', payloads)
+
+    stats = network.get_stats()
+    assert stats['total_messages'] + stats['omitted_messages'] == 80
+    assert stats['omitted_messages'] > 0
+
+    received = 0
+    for party_id in range(4):
+        if network.queues[party_id].empty():
+            continue
+        message = await network.receive(party_id)
+        seqs = [p['seq'] for p in message.payload]
+        # Survivors keep their order; nothing is duplicated
+        assert seqs == sorted(set(seqs))
+        received += len(seqs)
+    assert received == stats['total_messages']
+
+
 @pytest.mark.asyncio
 async def test_network_omissions():
     """Test that faulty parties omit messages."""
@@ -108,6 +171,37 @@ async def test_beacon_threshold():
     assert all(r == results[0] for r in results)
 
 
+@pytest.mark.asyncio
+async def test_beacon_releases_observed_index():
+    """Test that beacon state is freed once all parties have the value."""
+    n = 4
+    f = 1
+    beacon = RandomnessBeacon(n, f)
+
+    results = await asyncio.gather(*[beacon.request(i, index=0) for i in range(n)])
+
+    assert all(r == results[0] for r in results)
+    assert 0 not in beacon.requests
+    assert 0 not in beacon.values
+    assert beacon.get_invocation_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_beacon_late_request_after_release():
+    """Test that requests for a released index return its value at once."""
+    n = 4
+    f = 1
+    beacon = RandomnessBeacon(n, f)
+
+    results = await asyncio.gather(*[beacon.request(i, index=0) for i in range(n)])
+
+    # A duplicate request from a party that already observed the value
+    late = await asyncio.wait_for(beacon.request(0, index=0), timeout=1)
+    assert late == results[0]
+    assert 0 not in beacon.events
+    assert beacon.get_invocation_count() == 1
+
+
 @pytest.mark.asyncio
 async def test_beacon_multiple_indices():
     """Test beacon with multiple indices."""
@@ -138,12 +232,8 @@ async def test_rbc_honest():
 
     # Start message handlers
     async def handle_messages(party_id):
-        while True:
-            try:
-                msg = await asyncio.wait_for(network.receive(party_id), timeout=0.01)
-                await rbcs[party_id].handle_message(msg)
-            except asyncio.TimeoutError:
-                break
+        async for msg in network.stream(party_id):
+            await rbcs[party_id].handle_message(msg)
 
     handlers = [asyncio.create_task(handle_messages(i)) for i in range(n)]
 
@@ -163,8 +253,9 @@ async def test_rbc_honest():
             delivered_values.append(None)
 
     # Cleanup handlers
-    for h in handlers:
-        h.cancel()
+    for i in range(n):
+        network.close_stream(i)
+    await asyncio.gather(*handlers)
 
     # At least n-f parties should deliver
     non_none = [v for v in delivered_values if v is not None]
@@ -186,3 +277,87 @@ async def test_network_message_count():
     stats = network.get_stats()
     assert stats['total_messages'] == 6  # 2 sends + 4 broadcasts
 
+
+@pytest.mark.asyncio
+async def test_css_share_reconstruct():
+    """Test Complete Secret Sharing with honest parties."""
+    n = 4
+    f = 1
+    network = Network(n, faulty_parties=None, delay_range=(0, 0.001))
+    beacon = RandomnessBeacon(n, f)
+
+    csss = [CompleteSecretSharing(i, n, f, network, beacon) for i in range(n)]
+
+    async def handle_messages(party_id):
+        async for msg in network.stream(party_id):
+            await csss[party_id].handle_message(msg)
+
+    handlers = [asyncio.create_task(handle_messages(i)) for i in range(n)]
+
+    # Party 0 deals, everyone else receives
+    secret = 17
+    await asyncio.wait_for(asyncio.gather(
+        csss[0].share(secret),
+        *[csss[i].receive_share(0) for i in range(1, n)]
+    ), timeout=5)
+
+    # Sub-shares are attributed to their senders, so every party is happy
+    assert all(csss[i].completed[0] for i in range(n))
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*[csss[i].reconstruct(0) for i in range(n)]), timeout=5
+    )
+
+    await network.wait_for_all_deliveries()
+    for i in range(n):
+        network.close_stream(i)
+    await asyncio.gather(*handlers)
+
+    assert results == [secret] * n
+
+
+def test_rbc_specialized_thresholds():
+    """Test that RBC instances share a per-(n, f) class with constant thresholds."""
+    network = Network(7)
+
+    rbc_a = ReliableBroadcast(0, 7, 2, network)
+    rbc_b = ReliableBroadcast(1, 7, 2, network)
+
+    assert type(rbc_a) is type(rbc_b)
+    assert isinstance(rbc_a, ReliableBroadcast)
+    assert rbc_a.echo_threshold == 5  # ceil((n+f+1)/2)
+    assert rbc_a.ready_threshold == 3
+    assert rbc_a.deliver_threshold == 5
+    assert type(ReliableBroadcast(0, 4, 1, network)) is not type(rbc_a)
+
+
+@pytest.mark.asyncio
+async def test_rbc_releases_state_after_delivery():
+    """Test that RBC keeps only the delivered value once a sender completes."""
+    n = 4
+    f = 1
+    network = Network(n, faulty_parties=None, delay_range=(0, 0.001))
+
+    rbcs = [ReliableBroadcast(i, n, f, network) for i in range(n)]
+
+    async def handle_messages(party_id):
+        async for msg in network.stream(party_id):
+            await rbcs[party_id].handle_message(msg)
+
+    handlers = [asyncio.create_task(handle_messages(i)) for i in range(n)]
+
+    await rbcs[0].broadcast(7)
+    values = await asyncio.wait_for(
+        asyncio.gather(*[rbcs[i].deliver(0) for i in range(n)]), timeout=1
+    )
+    await network.wait_for_all_deliveries()
+
+    for i in range(n):
+        network.close_stream(i)
+    await asyncio.gather(*handlers)
+
+    assert values == [7] * n
+    for rbc in rbcs[1:]:
+        assert 0 not in rbc.val_received
+        assert 0 not in rbc.echo_count
+        assert 0 not in rbc.ready_count